@@ -32,6 +32,7 @@ def main(asset_id: str = None, env_file: str = None):
     Handles argument parsing, environment loading, settings initialization,
     logging setup, and use case execution.
     Accepts asset_id and env_file programmatically for testing/integration.
+    Returns the UC3 result dict on success, None on any failure.
     """
 
     # Determine effective asset_id and env_file based on params or CLI args
@@ -142,6 +143,7 @@ def main(asset_id: str = None, env_file: str = None):
             for key, value in result.items():
                 if key != "error":
                     logger.info(f"  {key}: {value}")
+            return result
         elif result and result.get("error"):
             logger.error(
                 f"Use case UC3 completed with errors for asset '{asset_id_to_use}'. Error: {result.get('error')}. Details: {result}"
@@ -1,216 +1,385 @@
 #!/usr/bin/env python3
 import argparse
 import os
+import re
 import sys
+import time
 import logging
+import asyncio
+import itertools
+import collections
 import requests
 import json
-from dotenv import load_dotenv
+import functools
+import hashlib
+import ssl
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util import Retry
+from dotenv import dotenv_values
+
+try:
+    import aiohttp  # Optional, only needed for the --async mode
+except ImportError:
+    aiohttp = None
+
+try:
+    import orjson  # Optional, faster parsing of the (large) list responses
+except ImportError:
+    orjson = None
+
+try:
+    import httpx  # Optional, only needed for transport="httpx" (HTTP/2 needs httpx[http2])
+except ImportError:
+    httpx = None
+
+try:
+    import ijson  # Optional, streams large list responses instead of loading them at once
+except ImportError:
+    ijson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Exceptions that mean the request itself failed (no HTTP response), per available HTTP client
+_TRANSPORT_ERRORS = (requests.exceptions.RequestException, Urllib3HTTPError) + ((httpx.HTTPError,) if httpx is not None else ())
+_ASYNC_TRANSPORT_ERRORS = (asyncio.TimeoutError,) + ((aiohttp.ClientError,) if aiohttp is not None else ()) + ((httpx.HTTPError,) if httpx is not None else ())
+
+
+def _json_dumps(obj, indent: bool = False):
+    """Serializes obj to a JSON string, with orjson if available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+def _request_body_kwargs(json_payload, bytes_kwarg: str = "data"):
+    """Returns the request keyword argument for a JSON body: pre-encoded bytes via orjson, else json=.
+
+    bytes_kwarg is the name the HTTP client uses for a raw body ("data" for requests/aiohttp, "content" for httpx).
+    """
+    if orjson is not None and json_payload is not None:
+        # The session headers already declare Content-Type: application/json
+        return {bytes_kwarg: orjson.dumps(json_payload)}
+    return {"json": json_payload}
 
 # Setup basic logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class ProviderAssetCleaner:
+# Remembers per base_url which asset list endpoint the EDC supports, so later runs skip the probe
+ENDPOINT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "rox-edc-asset-exchange", "endpoint.json")
+# On-disk copies of the contract definition/agreement listings, reused by runs within --cache-ttl seconds
+LIST_CACHE_DIR = os.path.join(os.path.dirname(ENDPOINT_CACHE_FILE), "lists")
+# Page size of the QuerySpec list requests; the contract definition/agreement listings are fetched page by page
+QUERY_PAGE_SIZE = 500
+# Fields the CD/CA listings can be filtered on server-side, and how many asset IDs go into one 'in' filter (at most QUERY_PAGE_SIZE,
+# so get_assets_by_ids gets each batch in one page)
+CD_ASSET_FILTER_OPERAND = "assetsSelector.operandRight"
+CA_ASSET_FILTER_OPERAND = "assetId"
+ASSET_FILTER_BATCH_SIZE = 200
+# List responses with a larger Content-Length are parsed item by item with ijson (if installed)
+STREAM_PARSE_MIN_BYTES = 64 * 1024
+
+class QueryRejectedError(RuntimeError):
+    """Raised when the EDC does not answer a filtered QuerySpec request with a list, e.g. because it does not support the filter."""
+
+
+class IncompleteListingError(RuntimeError):
+    """Raised when a QuerySpec page after the first one fails, so the listing would silently miss items."""
+
+
+class _LazyStr:
+    """Log argument that is only computed when the record is actually formatted."""
+    __slots__ = ("_fn",)
+
+    def __init__(self, fn):
+        self._fn = fn
+
+    def __str__(self):
+        return str(self._fn())
+
+
+# One comma separated part of the selection input: 'A' (all), 'N' (none), a number or a range like '3-7'; empty parts are allowed
+_SELECT_TOKEN = re.compile(r'\s*(?:([AN])|(\d+)(?:\s*-\s*(\d+))?)?\s*(,|$)')
+
+# Property keys that may hold an asset's display name, in order of preference (namespaced keys are added per namespace)
+_NAME_KEYS = ('asset:prop:name', 'name', 'id', 'dct:title')
+
+
+@functools.lru_cache(maxsize=None)
+def _name_keys_for(ns: str):
+    """Returns _NAME_KEYS extended by the name/id keys of the EDC namespace ns."""
+    return _NAME_KEYS + (ns + 'name', ns + 'id')
+
+
+def _extract_name(asset_data: dict, ns: str, scan_all_keys: bool = False):
+    """Returns the display name of an asset from its properties, falling back to its name/id/@id.
+
+    With scan_all_keys, any other property key containing 'name' or 'id' is tried before the fallback.
+    """
+    props = asset_data.get('properties') or asset_data.get('asset:properties')
+    if isinstance(props, dict):
+        name = next(filter(None, map(props.get, _name_keys_for(ns))), None)
+        if name:
+            return name
+        if scan_all_keys:
+            for key, value in props.items():
+                lower_key = key.lower()
+                if value and ('name' in lower_key or 'id' in lower_key):
+                    return value
+    return asset_data.get('name') or asset_data.get('id') or asset_data.get('@id')
+
+
+def _chunked(iterable, size: int):
+    """Yields lists of at most size items from iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _httpx_http2_available():
+    """Returns True if httpx can speak HTTP/2 (the 'h2' package is installed); warns otherwise."""
+    try:
+        import h2  # noqa: F401 - only checks that HTTP/2 support is installed
+        return True
+    except ImportError:
+        logger.warning("Package 'h2' is not installed, httpx will use HTTP/1.1. Install 'httpx[http2]' for HTTP/2.")
+        return False
+
+
+def create_ssl_context():
+    """Returns the SSL context shared by all HTTPS connections of a create_session session.
+
+    The context trusts the same CA bundle as a default requests session: REQUESTS_CA_BUNDLE or CURL_CA_BUNDLE if set,
+    certifi otherwise. It has to be loaded here, since requests 2.32.x passes no CA bundle for a caller-supplied context.
+    """
+    ca_bundle = os.environ.get("REQUESTS_CA_BUNDLE") or os.environ.get("CURL_CA_BUNDLE") or requests.certs.where()
+    if os.path.isdir(ca_bundle):
+        context = ssl.create_default_context(capath=ca_bundle)
+    else:
+        context = ssl.create_default_context(cafile=ca_bundle)  # Hostname checks and CERT_REQUIRED are on by default
+    context.options &= ~ssl.OP_NO_TICKET  # Keep TLS session tickets on, so the server can offer resumption
+    return context
+
+
+class _SharedSSLContextAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools share one ssl.SSLContext instead of building a new one per TLS connection."""
+
+    def __init__(self, *args, ssl_context: ssl.SSLContext = None, **kwargs):
+        self._ssl_context = ssl_context  # Set first, HTTPAdapter.__init__ calls init_poolmanager
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        # getattr: an unpickled adapter is rebuilt via init_poolmanager without running __init__
+        kwargs.setdefault("ssl_context", getattr(self, "_ssl_context", None))
+        return super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, *args, **kwargs):
+        kwargs.setdefault("ssl_context", getattr(self, "_ssl_context", None))
+        return super().proxy_manager_for(*args, **kwargs)
+
+
+def create_session(pool_maxsize: int = 64):
+    """Returns a requests.Session with a keep-alive connection pool of pool_maxsize and retries on 502/503/504."""
+    session = requests.Session()
+    adapter = _SharedSSLContextAdapter(
+        ssl_context=create_ssl_context(),
+        pool_connections=16,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET", "POST", "DELETE"]),
+            raise_on_status=False,  # Hand the last 5xx response back so _send_request reports it as usual
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class _CleanerBase:
+    """Configuration and response handling shared by the sync and async asset cleaners."""
+
     def __init__(self, base_url: str, api_key: str):
         if not base_url or not api_key:
             raise ValueError("BASE_URL and API_KEY must be provided.")
         self.base_url = base_url.rstrip('/')
         # All management API calls in this EDC seem to be prefixed with /data
         self.management_api_prefix = "/data" 
+        # Base of all management API URLs, built once instead of on every request
+        self._api_base = f"{self.base_url}{self.management_api_prefix}"
         self.api_key = api_key
         self.management_headers = {
             "Content-Type": "application/json",
+            "Accept": "application/json",
+            # Large list responses compress well; all supported HTTP clients decompress transparently
+            "Accept-Encoding": "gzip, deflate",
             "X-API-Key": self.api_key,
         }
         # EDC Namespace, often needed for context in queries, default if not in env
         self.edc_namespace = os.getenv("EDC_NAMESPACE", "https://w3id.org/edc/v0.0.1/ns/")
+        # operandLeft values of an asset selector criterion that matches on the asset ID
+        self._id_operand_values = frozenset((self.edc_namespace + 'id', 'https://w3id.org/edc/v0.0.1/ns/id'))
+        # The asset list attempt that last returned a list; tried first on later calls
+        self._assets_endpoint = self._load_assets_endpoint()
 
+    def _query_spec(self, offset: int = 0, filter_expr: list = None):
+        """Returns the QuerySpec payload used by the POST .../request list endpoints."""
+        query_spec = {
+            "@context": {"@vocab": self.edc_namespace},
+            "@type": "QuerySpec",
+            "limit": QUERY_PAGE_SIZE
+        }
+        if offset:
+            query_spec["offset"] = offset
+        if filter_expr:
+            query_spec["filterExpression"] = filter_expr
+        return query_spec
 
-    def _send_request(self, method: str, endpoint_path: str, json_payload: dict = None, params: dict = None, operation_name: str = "Operation"):
-        # Construct full URL with management_api_prefix and specific endpoint_path
-        url = f"{self.base_url}{self.management_api_prefix}{endpoint_path}"
-        logger.debug(f"{operation_name} - Method: {method}, URL: {url}, Payload: {json.dumps(json_payload) if json_payload else 'N/A'}")
-        try:
-            response = requests.request(method, url, headers=self.management_headers, json=json_payload, params=params)
-            logger.info(f"{operation_name} - Status: {response.status_code}")
-            
-            response_dict = {
-                "status_code": response.status_code,
-                "content": response.text 
-            }
-
-            if 200 <= response.status_code < 300:
-                if not response.content: 
-                    response_dict["status"] = "success_no_content"
-                    response_dict["data"] = None 
-                else:
-                    try:
-                        response_dict["data"] = response.json()
-                        response_dict["status"] = "success_json"
-                    except ValueError:
-                        logger.warning(f"{operation_name} - Response was not JSON despite success status. Content: {response.text[:200]}")
-                        response_dict["status"] = "success_non_json"
-                        # "data" will not be set, but "content" has the raw text
-                # For all success cases, return the populated dict
-                return response_dict
-            else: # HTTP error status codes (300+)
-                response_dict["status"] = "failed"
+    def _count_query_spec(self, limit: int):
+        """Returns a QuerySpec that asks for at most limit items, for the count_* probes."""
+        query_spec = self._query_spec()
+        query_spec["limit"] = limit
+        return query_spec
+
+    def _count_from_response(self, response_dict: dict):
+        """Returns the number of items in a count_* probe response, or None if it did not return a list."""
+        if response_dict and response_dict.get("status") == "success_json" and isinstance(response_dict.get("data"), list):
+            return len(response_dict["data"])
+        return None
+
+    def _check_filtered_page(self, response_dict: dict, filter_expr: list, operation_name: str):
+        """Raises QueryRejectedError if a filtered page request did not return a list."""
+        if filter_expr and not (response_dict and response_dict.get("status") == "success_json" and isinstance(response_dict.get("data"), list)):
+            raise QueryRejectedError(f"{operation_name} with filterExpression failed: {str(response_dict.get('error') if response_dict else response_dict)[:300]}")
+
+    def _check_later_page(self, response_dict: dict, offset: int, operation_name: str):
+        """Raises IncompleteListingError if a page after the first one (offset > 0) did not return a list."""
+        if offset and not (response_dict and response_dict.get("status") == "success_json" and isinstance(response_dict.get("data"), list)):
+            raise IncompleteListingError(f"{operation_name} (offset {offset}) failed, the listing would be incomplete: {str(response_dict.get('error') if response_dict else response_dict)[:300]}")
+
+    def _log_repeated_page(self, operation_name: str, offset: int):
+        logger.warning("%s (offset %s) returned the previous page again, the EDC seems to ignore the offset. Only the first %s items are used.", operation_name, offset, offset)
+
+    def _next_page_marker(self, response_dict: dict):
+        """Returns the first @id of a full QuerySpec page (so another page may follow), or None if this was the last page."""
+        data = response_dict.get("data") if response_dict and response_dict.get("status") == "success_json" else None
+        if not isinstance(data, list) or len(data) != QUERY_PAGE_SIZE:
+            return None
+        first_item = data[0]
+        return first_item.get('@id', '') if isinstance(first_item, dict) else ''
+
+    def _build_response_dict(self, status_code: int, body: bytes, operation_name: str):
+        """Turns an HTTP status code and raw body into the response dict returned by _send_request."""
+        response_dict = {"status_code": status_code}
+
+        if 200 <= status_code < 300:
+            if not body: 
+                response_dict["status"] = "success_no_content"
+                response_dict["data"] = None 
+            else:
+                # Parse the raw bytes directly; the decoded text is only kept if the body is not JSON
                 try:
-                    error_json = response.json()
-                    # Log the full error internally here, as it's the first point of contact
-                    logger.error(f"{operation_name} - HTTP Error. Status: {response.status_code}, Parsed Error JSON:\n{json.dumps(error_json, indent=2)}")
-                    response_dict["error"] = error_json 
+                    response_dict["data"] = _json_loads(body)
+                    response_dict["status"] = "success_json"
                 except ValueError:
-                    # Log the full error internally here
-                    logger.error(f"{operation_name} - HTTP Error. Status: {response.status_code}, Raw Error Response: {response.text[:500]}")
-                    response_dict["error"] = response.text[:500] 
-                return response_dict # Return the structured error dictionary
+                    text = body.decode("utf-8", errors="replace")
+                    logger.warning("%s - Response was not JSON despite success status. Content: %s", operation_name, text[:200])
+                    response_dict["status"] = "success_non_json"
+                    response_dict["content"] = text
+                    # "data" will not be set, but "content" has the raw text
+            # For all success cases, return the populated dict
+            return response_dict
+        else: # HTTP error status codes (300+)
+            text = body.decode("utf-8", errors="replace") if body else ""
+            response_dict["status"] = "failed"
+            response_dict["content"] = text
+            try:
+                error_json = _json_loads(body)
+                # Log the full error internally here, as it's the first point of contact
+                logger.error("%s - HTTP Error. Status: %s, Parsed Error JSON:\n%s", operation_name, status_code, _LazyStr(lambda: _json_dumps(error_json, indent=True)))
+                response_dict["error"] = error_json 
+            except ValueError:
+                # Log the full error internally here
+                logger.error("%s - HTTP Error. Status: %s, Raw Error Response: %s", operation_name, status_code, text[:500])
+                response_dict["error"] = text[:500] 
+            return response_dict # Return the structured error dictionary
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"{operation_name} - Request Exception: {e}")
-            # Ensure a consistent dictionary structure for exceptions too
-            return {"status": "exception", "status_code": None, "error": str(e), "content": str(e)}
+    def _asset_list_attempts(self):
+        """Returns the asset list attempts in probe order as (method, path, payload, params, parser) tuples."""
+        return [
+            ("GET", "/v3/assets", None, {"limit": 500}, self._parse_v3_list),
+            ("POST", "/v3/assets/request", self._query_spec(), None, self._parse_v3_list),
+            ("POST", "/v2/assets/request", self._query_spec(), None, self._parse_v2_list),
+            ("GET", "/v2/assets", None, {"limit": 500}, self._parse_v2_list),
+        ]
 
-    def list_assets(self):
-        """Lists all assets using provider's management API, trying /v3/ endpoints first, then /v2/ as fallback."""
-        
-        # Primary attempt: GET to /v3/assets
-        primary_endpoint_path = "/v3/assets" 
-        operation_name_primary = "List Assets (GET /v3/assets)"
-        logger.info(f"Attempting to list assets: {operation_name_primary} from {self.base_url}{self.management_api_prefix}{primary_endpoint_path}")
-        response_dict = self._send_request("GET", primary_endpoint_path, params={"limit": 500}, operation_name=operation_name_primary)
-        
-        actual_asset_list = None
-        if response_dict and response_dict.get("status") in ["success_json", "success_non_json"] and isinstance(response_dict.get("data"), list):
-            actual_asset_list = response_dict.get("data")
-        elif response_dict and response_dict.get("status_code") == 200 and isinstance(response_dict.get("content"), str): # Non-json success with string content
-            try:
-                actual_asset_list = json.loads(response_dict.get("content"))
-                if not isinstance(actual_asset_list, list):
-                    actual_asset_list = None # ensure it's a list
-            except json.JSONDecodeError:
-                logger.warning(f"{operation_name_primary} - Content was not valid JSON despite 200 status and non-empty content.")
-                actual_asset_list = None
-
-        if actual_asset_list is not None: # Check if we got a list of assets
-            assets = []
-            for asset_data in actual_asset_list:
-                asset_id = asset_data.get('@id')
-                if asset_id:
-                    asset_name = asset_data.get('name', asset_data.get('id', asset_id))
-                    properties = asset_data.get('properties')
-                    if isinstance(properties, dict):
-                        name_candidates = ['asset:prop:name', 'name', 'id', self.edc_namespace + 'name', self.edc_namespace + 'id']
-                        name_candidates.extend([key for key in properties.keys() if 'name' in key.lower() or 'id' in key.lower()])
-                        for cand_key in name_candidates:
-                            if properties.get(cand_key):
-                                asset_name = properties.get(cand_key)
-                                break
-                    elif isinstance(asset_data.get('asset:properties'), dict):
-                        properties = asset_data.get('asset:properties')
-                        name_candidates = ['asset:prop:name', 'name', 'id', 'dct:title', self.edc_namespace + 'name', self.edc_namespace + 'id']
-                        for cand_key in name_candidates:
-                            if properties.get(cand_key):
-                                asset_name = properties.get(cand_key)
-                                break
-                    assets.append({'@id': asset_id, 'name': asset_name})
-            
-            logger.info(f"Found {len(assets)} assets via {operation_name_primary}.")
-            return assets
-        elif response_dict and response_dict.get("status") == "failed":
-             logger.warning(f"Error listing assets with {operation_name_primary}: {response_dict.get('error')}. Trying next method.")
-        else:
-            logger.warning(f"Failed to list assets with {operation_name_primary} or unexpected response format. Response: {str(response_dict)[:300]}. Trying next method.")
+    def _load_assets_endpoint(self):
+        """Returns the asset list attempt recorded for this base_url in ENDPOINT_CACHE_FILE, or None."""
+        try:
+            with open(ENDPOINT_CACHE_FILE, "rb") as f:
+                method_and_path = _json_loads(f.read()).get(self.base_url)
+        except (OSError, ValueError, AttributeError):
+            return None
+        for attempt in self._asset_list_attempts():
+            if [attempt[0], attempt[1]] == method_and_path:
+                logger.debug("Using remembered asset list endpoint %s %s for %s", attempt[0], attempt[1], self.base_url)
+                return attempt
+        return None
 
-        # Second attempt: POST to /v3/assets/request with a QuerySpec
-        secondary_endpoint_path = "/v3/assets/request" 
-        payload_v3_request = {
-            "@context": {"@vocab": self.edc_namespace},
-            "@type": "QuerySpec",
-            "limit": 500
-        }
-        operation_name_secondary = "List Assets (POST /v3/assets/request)"
-        logger.info(f"Attempting to list assets: {operation_name_secondary} from {self.base_url}{self.management_api_prefix}{secondary_endpoint_path}")
-        response_dict_v3_post = self._send_request("POST", secondary_endpoint_path, json_payload=payload_v3_request, operation_name=operation_name_secondary)
-        
-        actual_asset_list_v3_post = None
-        if response_dict_v3_post and response_dict_v3_post.get("status") == "success_json" and isinstance(response_dict_v3_post.get("data"), list):
-            actual_asset_list_v3_post = response_dict_v3_post.get("data")
-
-        if actual_asset_list_v3_post is not None:
-            assets = []
-            for asset_data in actual_asset_list_v3_post:
-                asset_id = asset_data.get('@id')
-                if asset_id:
-                    asset_name = asset_data.get('name', asset_data.get('id', asset_id))
-                    properties = asset_data.get('properties', asset_data.get('asset:properties'))
-                    if isinstance(properties, dict):
-                        name_candidates = ['asset:prop:name', 'name', 'id', 'dct:title', self.edc_namespace + 'name', self.edc_namespace + 'id']
-                        for cand_key in name_candidates:
-                            if properties.get(cand_key):
-                                asset_name = properties.get(cand_key)
-                                break
-                    assets.append({'@id': asset_id, 'name': asset_name})
-            logger.info(f"Found {len(assets)} assets via {operation_name_secondary}.")
-            return assets
-        elif response_dict_v3_post and response_dict_v3_post.get("status") == "failed":
-            logger.warning(f"Error listing assets with {operation_name_secondary}: {response_dict_v3_post.get('error')}. Trying /v2/ fallbacks.")
-        else:
-            logger.warning(f"Failed to list assets with {operation_name_secondary} or unexpected response format. Response: {str(response_dict_v3_post)[:300]}. Trying /v2/ fallbacks.")
+    def _remember_assets_endpoint(self, attempt):
+        """Stores the asset list attempt that worked, in memory and in ENDPOINT_CACHE_FILE."""
+        if self._assets_endpoint is not None and self._assets_endpoint[:2] == attempt[:2]:
+            self._assets_endpoint = attempt
+            return
+        self._assets_endpoint = attempt
+        try:
+            try:
+                with open(ENDPOINT_CACHE_FILE, "rb") as f:
+                    endpoints = _json_loads(f.read())
+                if not isinstance(endpoints, dict):
+                    endpoints = {}
+            except (OSError, ValueError):
+                endpoints = {}
+            endpoints[self.base_url] = [attempt[0], attempt[1]]
+            os.makedirs(os.path.dirname(ENDPOINT_CACHE_FILE), exist_ok=True)
+            with open(ENDPOINT_CACHE_FILE, "w") as f:
+                f.write(_json_dumps(endpoints, indent=True))
+        except OSError as e:
+            logger.debug("Could not persist asset list endpoint to %s: %s", ENDPOINT_CACHE_FILE, e)
 
-        # Fallback attempt 1: POST to /v2/assets/request with a QuerySpec
-        fallback_v2_post_path = "/v2/assets/request" 
-        payload_v2_request = {
-            "@context": {"@vocab": self.edc_namespace},
-            "@type": "QuerySpec",
-            "limit": 500
-        }
-        operation_name_fallback_v2_post = "List Assets (POST /v2/assets/request)"
-        logger.info(f"Attempting to list assets: {operation_name_fallback_v2_post} from {self.base_url}{self.management_api_prefix}{fallback_v2_post_path}")
-        response_dict_v2_post = self._send_request("POST", fallback_v2_post_path, json_payload=payload_v2_request, operation_name=operation_name_fallback_v2_post)
-        
-        actual_asset_list_v2_post = None
-        if response_dict_v2_post and response_dict_v2_post.get("status") == "success_json" and isinstance(response_dict_v2_post.get("data"), list):
-            actual_asset_list_v2_post = response_dict_v2_post.get("data")
+    def _log_bulk_summary(self, results: dict, item_label: str):
+        """Logs the outcome of a bulk deletion given a dict of ID -> success."""
+        failed_ids = [item_id for item_id, ok in results.items() if not ok]
+        logger.info("Bulk delete %ss finished: %s succeeded, %s failed.", item_label, len(results) - len(failed_ids), len(failed_ids))
+        if failed_ids:
+            logger.warning("Failed to delete %s(s): %s", item_label, ', '.join(failed_ids))
 
-        if actual_asset_list_v2_post is not None:
-            assets = [{'@id': asset.get('@id'), 'name': asset.get('properties',{}).get('asset:prop:name', asset.get('@id'))} for asset in actual_asset_list_v2_post if asset.get('@id')]
-            logger.info(f"Found {len(assets)} assets via {operation_name_fallback_v2_post}.")
-            return assets
-        elif response_dict_v2_post and response_dict_v2_post.get("status") == "failed":
-             logger.warning(f"Error listing assets with {operation_name_fallback_v2_post}: {response_dict_v2_post.get('error')}. Trying next method.")
-        else:
-            logger.warning(f"Failed to list assets with {operation_name_fallback_v2_post} or unexpected response format. Response: {str(response_dict_v2_post)[:300]}. Trying next method.")
+    def _parse_v3_list(self, asset_list: list):
+        """Reduces a /v3/ asset list result (GET or POST /request) to a list of {'@id', 'name'} dicts."""
+        ns = self.edc_namespace
+        return [{'@id': asset_id, 'name': _extract_name(asset_data, ns, scan_all_keys=True)} for asset_data in asset_list if (asset_id := asset_data.get('@id'))]
 
-        # Fallback attempt 2: GET to /v2/assets
-        fallback_v2_get_path = "/v2/assets" 
-        operation_name_fallback_v2_get = "List Assets (GET /v2/assets)"
-        logger.info(f"Trying fallback: {operation_name_fallback_v2_get} from {self.base_url}{self.management_api_prefix}{fallback_v2_get_path}")
-        response_dict_v2_get = self._send_request("GET", fallback_v2_get_path, params={"limit": 500}, operation_name=operation_name_fallback_v2_get)
-        
-        actual_asset_list_v2_get = None
-        if response_dict_v2_get and response_dict_v2_get.get("status") == "success_json" and isinstance(response_dict_v2_get.get("data"), list):
-            actual_asset_list_v2_get = response_dict_v2_get.get("data")
-        
-        if actual_asset_list_v2_get is not None:
-            assets = [{'@id': asset.get('@id'), 'name': asset.get('properties',{}).get('asset:prop:name', asset.get('@id'))} for asset in actual_asset_list_v2_get if asset.get('@id')]
-            logger.info(f"Found {len(assets)} assets via {operation_name_fallback_v2_get}.")
-            return assets
-        
-        logger.error("Could not retrieve assets with any attempted method (/v3/assets GET, /v3/assets/request POST, /v2/assets/request POST, /v2/assets GET). Please check EDC logs for supported endpoints.")
-        return []
+    def _parse_v2_list(self, asset_list: list):
+        """Reduces a /v2/ asset list result to a list of {'@id', 'name'} dicts."""
+        return [{'@id': asset_id, 'name': asset.get('properties',{}).get('asset:prop:name', asset_id)} for asset in asset_list if (asset_id := asset.get('@id'))]
 
-    def delete_asset(self, asset_id: str):
-        """Deletes an asset by its ID using /v3/assets/{asset_id}."""
-        endpoint_path = f"/v3/assets/{asset_id}" # Path relative to management_api_prefix
-        operation_name = f"Delete Asset {asset_id}"
-        logger.info(f"Attempting to delete asset: {asset_id} via {self.base_url}{self.management_api_prefix}{endpoint_path}")
-        
-        response_data = self._send_request("DELETE", endpoint_path, operation_name=operation_name)
+    def _assets_from_response(self, response_dict: dict, parser):
+        """Returns the parsed assets of one list attempt, or None if the endpoint did not deliver a list."""
+        if not response_dict or response_dict.get("status") not in ("success_json", "success_non_json") or not isinstance(response_dict.get("data"), list):
+            return None
+        return response_dict["data"] if response_dict.get("streamed") else parser(response_dict["data"])
 
+    def _handle_asset_deletion_response(self, asset_id: str, response_data: dict):
+        """Evaluates a DELETE asset response and logs the outcome. Returns True on success."""
         if not response_data or not isinstance(response_data, dict):
-            logger.error(f"Failed to delete asset '{asset_id}'. Invalid response from _send_request: {str(response_data)[:1000]}")
+            logger.error("Failed to delete asset '%s'. Invalid response from _send_request: %s", asset_id, _LazyStr(lambda: str(response_data)[:1000]))
             return False
 
         status_code = response_data.get("status_code")
@@ -226,7 +395,7 @@ class ProviderAssetCleaner:
             is_success = True
 
         if is_success:
-            logger.info(f"Asset '{asset_id}' deleted successfully (Status: {status_code}).")
+            logger.info("Asset '%s' deleted successfully (Status: %s).", asset_id, status_code)
             return True
         
         if status_code == 409:
@@ -238,31 +407,20 @@ class ProviderAssetCleaner:
                     message = error_details.get("message", str(error_details))
                 else:
                     message = str(error_details) 
-            logger.warning(f"Asset '{asset_id}' cannot be deleted. Status: 409. EDC Message: {message}")
+            logger.warning("Asset '%s' cannot be deleted. Status: 409. EDC Message: %s", asset_id, message)
             return False
         
         if status_code is not None and status_code >= 300: # Covers 4xx and 5xx errors not specifically 409
             failure_reason = str(error_details if error_details else response_data.get("content", "Unknown error"))
-            logger.error(f"Failed to delete asset '{asset_id}'. Status: {status_code}. Details: {failure_reason[:1000]}")
+            logger.error("Failed to delete asset '%s'. Status: %s. Details: %s", asset_id, status_code, failure_reason[:1000])
             return False
         
         # Fallback for other cases, e.g. status="exception" or unexpected structure
-        logger.error(f"Failed to delete asset '{asset_id}'. Status: {status_code if status_code else 'N/A'}, Response Status: {response_status if response_status else 'N/A'}, Details: {str(error_details if error_details else response_data.get('content', 'No content'))[:1000]}")
+        logger.error("Failed to delete asset '%s'. Status: %s, Response Status: %s, Details: %s", asset_id, status_code if status_code else 'N/A', response_status if response_status else 'N/A', _LazyStr(lambda: str(error_details if error_details else response_data.get('content', 'No content'))[:1000]))
         return False
 
-    # --- Contract Definition Management --- 
-    def list_contract_definitions(self):
-        """Lists all contract definitions using /v2/contractdefinitions/request."""
-        endpoint_path = "/v2/contractdefinitions/request"
-        payload = {
-            "@context": {"@vocab": self.edc_namespace},
-            "@type": "QuerySpec",
-            "limit": 500 
-        }
-        operation_name = "List Contract Definitions"
-        logger.info(f"Attempting to list contract definitions from {self.base_url}{self.management_api_prefix}{endpoint_path}")
-        response_dict = self._send_request("POST", endpoint_path, json_payload=payload, operation_name=operation_name)
-        
+    def _handle_contract_definitions_response(self, response_dict: dict):
+        """Extracts the processed contract definitions from a list response, or [] on failure."""
         definitions = []
         actual_cd_list = None
 
@@ -273,11 +431,11 @@ class ProviderAssetCleaner:
         if actual_cd_list is not None:
             for cd_data_item in actual_cd_list: 
                 if not isinstance(cd_data_item, dict): 
-                    logger.warning(f"Skipping non-dictionary item in contract definition list: {str(cd_data_item)[:100]}")
+                    logger.warning("Skipping non-dictionary item in contract definition list: %s", _LazyStr(lambda: str(cd_data_item)[:100]))
                     continue
                 cd_id = cd_data_item.get('@id')
                 if not cd_id:
-                    logger.warning(f"Skipping contract definition item with no '@id': {str(cd_data_item)[:100]}")
+                    logger.warning("Skipping contract definition item with no '@id': %s", _LazyStr(lambda: str(cd_data_item)[:100]))
                     continue
 
                 asset_selector_value = None
@@ -287,26 +445,20 @@ class ProviderAssetCleaner:
                 if isinstance(assets_selector_raw, dict): 
                     criteria_to_check.append(assets_selector_raw)
                 elif isinstance(assets_selector_raw, list): 
-                    criteria_to_check = assets_selector_raw
+                    criteria_to_check = [criterion for criterion in assets_selector_raw if isinstance(criterion, dict)]
                 elif 'criterion' in cd_data_item:
                     criterion_fallback = cd_data_item.get('criterion')
                     if isinstance(criterion_fallback, dict):
                         criteria_to_check.append(criterion_fallback)
                     elif isinstance(criterion_fallback, list):
-                        criteria_to_check.extend(criterion_fallback)
+                        criteria_to_check.extend(criterion for criterion in criterion_fallback if isinstance(criterion, dict))
                 
+                id_operand_values = self._id_operand_values
                 for criterion in criteria_to_check:
-                    if isinstance(criterion, dict):
-                        op_left = criterion.get('operandLeft')
-                        op_operator = criterion.get('operator')
-                        is_edc_id_operand = (op_left == (self.edc_namespace + 'id') or 
-                                             op_left == 'https://w3id.org/edc/v0.0.1/ns/id')
-                        is_equals_operator = (op_operator == '=')
-                        
-                        if is_edc_id_operand and is_equals_operator:
-                            asset_selector_value = criterion.get('operandRight')
-                            if asset_selector_value: 
-                                break 
+                    if criterion.get('operator') == '=' and criterion.get('operandLeft') in id_operand_values:
+                        asset_selector_value = criterion.get('operandRight')
+                        if asset_selector_value: 
+                            break 
                 
                 definitions.append({
                     '@id': cd_id,
@@ -314,68 +466,35 @@ class ProviderAssetCleaner:
                     'contractPolicyId': cd_data_item.get('contractPolicyId'),
                     'assetsSelectorTarget': asset_selector_value
                 })
-            logger.info(f"Found and processed {len(definitions)} contract definitions.")
+            logger.info("Found and processed %s contract definitions.", len(definitions))
             # Return here, as we successfully processed the list
             return definitions 
         
         # Handle error cases or unexpected format after attempting to get actual_cd_list
         if response_dict and response_dict.get("status") == "failed":
-             logger.error(f"Error listing contract definitions (server reported error): {response_dict.get('error')}")
+             logger.error("Error listing contract definitions (server reported error): %s", response_dict.get('error'))
         else:
             # This covers cases like status != success_json, or actual_cd_list was None for other reasons
-            logger.warning(f"Failed to list contract definitions or unexpected response format. Full Response: {str(response_dict)[:500]}")
+            logger.warning("Failed to list contract definitions or unexpected response format. Full Response: %s", _LazyStr(lambda: str(response_dict)[:500]))
         return [] # Return empty list if not successful
 
-    def get_raw_contract_definition(self, cd_id: str):
-        """Fetches the raw JSON for a single contract definition by its ID."""
-        endpoint_path = f"/v2/contractdefinitions/{cd_id}"
-        operation_name = f"Get Raw Contract Definition {cd_id}"
-        logger.info(f"Attempting to get raw contract definition: {cd_id} from {self.base_url}{self.management_api_prefix}{endpoint_path}")
-        # _send_request returns the parsed JSON directly on success, or an error dict
-        response_data = self._send_request("GET", endpoint_path, operation_name=operation_name)
-        
-        if response_data and not response_data.get("error") and response_data.get("status_code") is None: # Success and has content
-             # if _send_request returns data directly without status_code in a wrapper for GET success
-            return response_data 
-        elif response_data and response_data.get("status_code") and response_data.get("status_code") >= 200 and response_data.get("status_code") < 300:
-            return response_data # It might be wrapped if _send_request changes, but usually direct for GET
-        else:
-            logger.error(f"Failed to get raw contract definition '{cd_id}'. Response: {response_data}")
-            return None
-
-    def delete_contract_definition(self, cd_id: str):
-        """Deletes a contract definition by its ID using /v2/contractdefinitions/{id}."""
-        endpoint_path = f"/v2/contractdefinitions/{cd_id}"
-        operation_name = f"Delete Contract Definition {cd_id}"
-        logger.info(f"Attempting to delete contract definition: {cd_id} via {self.base_url}{self.management_api_prefix}{endpoint_path}")
-        response_data = self._send_request("DELETE", endpoint_path, operation_name=operation_name)
-
+    def _handle_contract_definition_deletion_response(self, cd_id: str, response_data: dict):
+        """Evaluates a DELETE contract definition response and logs the outcome. Returns True on success."""
         if not response_data:
-            logger.error(f"Failed to delete contract definition '{cd_id}'. No response from server.")
+            logger.error("Failed to delete contract definition '%s'. No response from server.", cd_id)
             return False
         
         status_code = response_data.get("status_code")
         if status_code == 200 or status_code == 204 or response_data.get("status") == "success_no_content":
-            logger.info(f"Contract definition '{cd_id}' deleted successfully (Status: {status_code if status_code else '204 via status'}).")
+            logger.info("Contract definition '%s' deleted successfully (Status: %s).", cd_id, status_code if status_code else '204 via status')
             return True
         else:
             error_payload = response_data.get("error", response_data.get("content", "Unknown error"))
-            logger.error(f"Failed to delete contract definition '{cd_id}'. Status: {status_code if status_code else 'N/A'}, Details: {str(error_payload)[:1000]}")
+            logger.error("Failed to delete contract definition '%s'. Status: %s, Details: %s", cd_id, status_code if status_code else 'N/A', _LazyStr(lambda: str(error_payload)[:1000]))
             return False
 
-    # --- Contract Agreement Management ---
-    def list_contract_agreements(self):
-        """Lists all contract agreements using /v2/contractagreements/request."""
-        endpoint_path = "/v2/contractagreements/request" 
-        payload = {
-            "@context": {"@vocab": self.edc_namespace},
-            "@type": "QuerySpec",
-            "limit": 500 
-        }
-        operation_name = "List Contract Agreements"
-        logger.info(f"Attempting to list contract agreements from {self.base_url}{self.management_api_prefix}{endpoint_path}")
-        response_dict = self._send_request("POST", endpoint_path, json_payload=payload, operation_name=operation_name)
-        
+    def _handle_contract_agreements_response(self, response_dict: dict):
+        """Extracts the processed contract agreements from a list response, or [] on failure."""
         agreements = []
         actual_ca_list = None
 
@@ -385,11 +504,11 @@ class ProviderAssetCleaner:
         if actual_ca_list is not None:
             for ca_data_item in actual_ca_list:
                 if not isinstance(ca_data_item, dict):
-                    logger.warning(f"Skipping non-dictionary item in contract agreement list: {str(ca_data_item)[:100]}")
+                    logger.warning("Skipping non-dictionary item in contract agreement list: %s", _LazyStr(lambda: str(ca_data_item)[:100]))
                     continue
                 ca_id = ca_data_item.get('@id')
                 if not ca_id:
-                    logger.warning(f"Skipping contract agreement item with no '@id': {str(ca_data_item)[:100]}")
+                    logger.warning("Skipping contract agreement item with no '@id': %s", _LazyStr(lambda: str(ca_data_item)[:100]))
                     continue
                 
                 # Attempt to extract assetId. Common EDC field name is 'assetId'.
@@ -416,24 +535,19 @@ class ProviderAssetCleaner:
                     'consumerId': ca_data_item.get('consumerId')
                     # Add other fields like contractStartDate, contractEndDate if useful for debugging later
                 })
-            logger.info(f"Found and processed {len(agreements)} contract agreements.")
+            logger.info("Found and processed %s contract agreements.", len(agreements))
             return agreements
         
         if response_dict and response_dict.get("status") == "failed":
-             logger.error(f"Error listing contract agreements (server reported error): {response_dict.get('error')}")
+             logger.error("Error listing contract agreements (server reported error): %s", response_dict.get('error'))
         else:
-            logger.warning(f"Failed to list contract agreements or unexpected response format. Full Response: {str(response_dict)[:500]}")
+            logger.warning("Failed to list contract agreements or unexpected response format. Full Response: %s", _LazyStr(lambda: str(response_dict)[:500]))
         return []
 
-    def delete_contract_agreement(self, agreement_id: str):
-        """Deletes a contract agreement by its ID using /v2/contractagreements/{id}."""
-        endpoint_path = f"/v2/contractagreements/{agreement_id}"
-        operation_name = f"Delete Contract Agreement {agreement_id}"
-        logger.info(f"Attempting to delete contract agreement: {agreement_id} via {self.base_url}{self.management_api_prefix}{endpoint_path}")
-        response_data = self._send_request("DELETE", endpoint_path, operation_name=operation_name)
-
+    def _handle_contract_agreement_deletion_response(self, agreement_id: str, response_data: dict):
+        """Evaluates a DELETE contract agreement response and logs the outcome. Returns True on success."""
         if not response_data or not isinstance(response_data, dict):
-            logger.error(f"Failed to delete contract agreement '{agreement_id}'. Invalid response from _send_request: {str(response_data)[:1000]}")
+            logger.error("Failed to delete contract agreement '%s'. Invalid response from _send_request: %s", agreement_id, _LazyStr(lambda: str(response_data)[:1000]))
             return False
 
         status_code = response_data.get("status_code")
@@ -449,91 +563,710 @@ class ProviderAssetCleaner:
             is_success = True
 
         if is_success:
-            logger.info(f"Contract agreement '{agreement_id}' deleted successfully (Status: {status_code}).")
+            logger.info("Contract agreement '%s' deleted successfully (Status: %s).", agreement_id, status_code)
             return True
         
         # Specific handling for 405 Method Not Allowed
         if status_code == 405:
-            logger.error(f"Failed to delete contract agreement '{agreement_id}'. Status: 405 (Method Not Allowed). This EDC may not support direct deletion of agreements via this endpoint.")
+            logger.error("Failed to delete contract agreement '%s'. Status: 405 (Method Not Allowed). This EDC may not support direct deletion of agreements via this endpoint.", agreement_id)
             return False
 
         failure_reason = str(error_details if error_details else response_data.get("content", "Unknown error"))
-        logger.error(f"Failed to delete contract agreement '{agreement_id}'. Status: {status_code if status_code else 'N/A'}, Details: {failure_reason[:1000]}")
+        logger.error("Failed to delete contract agreement '%s'. Status: %s, Details: %s", agreement_id, status_code if status_code else 'N/A', failure_reason[:1000])
         return False
 
-def get_user_selection(assets: list):
+class ProviderAssetCleaner(_CleanerBase):
+    def __init__(self, base_url: str, api_key: str, transport: str = "requests", session: requests.Session = None):
+        """transport selects the HTTP client: "requests" (default) or "httpx" (HTTP/2 capable, optional dependency).
+
+        session is an optional shared requests.Session (see create_session); by default the cleaner creates its own.
+        """
+        if transport not in ("requests", "httpx"):
+            raise ValueError(f"Unknown transport '{transport}'. Use 'requests' or 'httpx'.")
+        super().__init__(base_url, api_key)
+        # In-memory cache of list results, key -> (time.monotonic() timestamp, value)
+        self._cache = {}
+
+        # With transport="httpx" all calls go through one httpx.Client, which multiplexes
+        # concurrent requests over a single HTTP/2 connection if the server supports it
+        self._client = None
+        if transport == "httpx":
+            if httpx is None:
+                raise RuntimeError("transport='httpx' requires the 'httpx' package (pip install 'httpx[http2]').")
+            self._client = httpx.Client(
+                http2=_httpx_http2_available(),
+                base_url=self._api_base,
+                headers=self.management_headers,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+                timeout=httpx.Timeout(30.0, connect=5.0),
+            )
+
+        # One persistent session for all calls, so connections (TCP/TLS) are kept alive and reused.
+        # A session passed in by the caller is used as-is (apart from the headers) and not closed by close().
+        self._owns_session = session is None
+        self._session = create_session() if session is None else session
+        self._session.headers.update(self.management_headers)
+
+    def close(self):
+        """Closes the underlying HTTP session(s) and their pooled connections."""
+        if self._owns_session:
+            self._session.close()
+        if self._client is not None:
+            self._client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _cached(self, key: str, fn, ttl: float = 30):
+        """Returns fn(), reusing the result cached under key if it is younger than ttl seconds."""
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            logger.info("Using cached '%s' list (%s items, %.1fs old).", key, len(entry[1]), time.monotonic() - entry[0])
+            return entry[1]
+        value = fn()
+        if value: # Only successful (non-empty) results are cached, failures are retried on the next call
+            self._cache[key] = (time.monotonic(), value)
+        return value
+
+    def _send_request(self, method: str, endpoint_path: str, json_payload: dict = None, params: dict = None, operation_name: str = "Operation", stream_parser=None):
+        """Sends a management API request and returns a response dict (status, status_code, data/error/content).
+
+        If stream_parser is given and ijson is installed, a large successful JSON array response is
+        parsed item by item via _iter_assets_streaming; "data" then already holds the parsed items
+        and the dict is marked with "streamed": True.
+        """
+        # Construct full URL with management_api_prefix and specific endpoint_path
+        url = self._api_base + endpoint_path
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s - Method: %s, URL: %s, Payload: %s", operation_name, method, url, _json_dumps(json_payload) if json_payload else 'N/A')
+        stream = stream_parser is not None and ijson is not None
+        try:
+            if self._client is not None:
+                response = self._client.request(method, endpoint_path, params=params, **_request_body_kwargs(json_payload, "content"))
+                logger.info("%s - Status: %s (%s)", operation_name, response.status_code, response.http_version)
+                return self._build_response_dict(response.status_code, response.content, operation_name)
+
+            response = self._session.request(method, url, params=params, timeout=(5, 30), stream=stream, **_request_body_kwargs(json_payload))
+            logger.info("%s - Status: %s", operation_name, response.status_code)
+
+            if stream:
+                with response:
+                    content_length = int(response.headers.get("Content-Length") or 0)
+                    if 200 <= response.status_code < 300 and content_length > STREAM_PARSE_MIN_BYTES:
+                        try:
+                            data = list(self._iter_assets_streaming(response, stream_parser))
+                        except (ValueError, ijson.JSONError) as e:
+                            logger.warning("%s - Could not stream-parse response as a JSON array: %s", operation_name, e)
+                            return {"status": "success_non_json", "status_code": response.status_code, "content": ""}
+                        return {"status": "success_json", "status_code": response.status_code, "data": data, "streamed": True}
+                    return self._build_response_dict(response.status_code, response.content, operation_name)
+
+            return self._build_response_dict(response.status_code, response.content, operation_name)
+
+        except _TRANSPORT_ERRORS as e:
+            logger.error("%s - Request Exception: %s", operation_name, e)
+            # Ensure a consistent dictionary structure for exceptions too
+            return {"status": "exception", "status_code": None, "error": str(e), "content": str(e)}
+
+    def _iter_assets_streaming(self, response: requests.Response, parser):
+        """Yields the parsed assets of a JSON array response body while it is still being read.
+
+        Each array item is passed through parser (one of the _parse_* methods) on its own, so only
+        the reduced {'@id', 'name'} dicts are kept instead of the whole decoded list.
+        """
+        response.raw.decode_content = True
+        events = ijson.parse(response.raw, use_float=True)
+        first_event = next(events, None)
+        if first_event is None or first_event[1] != 'start_array':
+            raise ValueError("response body is not a JSON array")
+        for asset_data in ijson.items(itertools.chain([first_event], events), 'item'):
+            if isinstance(asset_data, dict):
+                yield from parser([asset_data])
+
+    def list_assets(self):
+        """Lists all assets using provider's management API, trying /v3/ endpoints first, then /v2/ as fallback.
+
+        The result is cached for a short time and invalidated when an asset is deleted.
+        """
+        return self._cached("assets", self._fetch_assets)
+
+    def _fetch_assets(self):
+        attempts = self._asset_list_attempts()
+        if self._assets_endpoint is not None:
+            # Try the endpoint that worked before first; the others remain as fallbacks
+            attempts = [self._assets_endpoint] + [attempt for attempt in attempts if attempt[:2] != self._assets_endpoint[:2]]
+
+        for method, endpoint_path, payload, params, parser in attempts:
+            operation_name = f"List Assets ({method} {endpoint_path})"
+            logger.info("Attempting to list assets: %s from %s%s", operation_name, self._api_base, endpoint_path)
+            response_dict = self._send_request(method, endpoint_path, json_payload=payload, params=params, operation_name=operation_name, stream_parser=parser)
+
+            assets = self._assets_from_response(response_dict, parser)
+            if assets is not None:
+                logger.info("Found %s assets via %s.", len(assets), operation_name)
+                self._remember_assets_endpoint((method, endpoint_path, payload, params, parser))
+                return assets
+            elif response_dict and response_dict.get("status") == "failed":
+                logger.warning("Error listing assets with %s: %s. Trying next method.", operation_name, response_dict.get('error'))
+            else:
+                logger.warning("Failed to list assets with %s or unexpected response format. Response: %s. Trying next method.", operation_name, _LazyStr(lambda: str(response_dict)[:300]))
+
+        logger.error("Could not retrieve assets with any attempted method (/v3/assets GET, /v3/assets/request POST, /v2/assets/request POST, /v2/assets GET). Please check EDC logs for supported endpoints.")
+        return []
+
+    def get_assets_by_ids(self, ids: list, max_workers: int = 8):
+        """Fetches several assets by ID with QuerySpec 'in' filters instead of one GET per asset.
+
+        IDs are queried in chunks of ASSET_FILTER_BATCH_SIZE (concurrently), each answered by a single QuerySpec page.
+        Returns a dict of asset ID -> raw asset data; IDs that do not exist on the provider are missing from the result.
+        """
+        def fetch_chunk(filter_expr):
+            chunk_size = len(filter_expr[0]["operandRight"])
+            response_dict = self._send_request("POST", "/v3/assets/request", json_payload=self._query_spec(filter_expr=filter_expr), operation_name=f"Get {chunk_size} Assets by ID")
+            if response_dict.get("status") == "success_json" and isinstance(response_dict.get("data"), list):
+                return response_dict["data"]
+            logger.warning("Failed to fetch assets by ID. Response: %s", _LazyStr(lambda: str(response_dict)[:300]))
+            return []
+
+        assets_by_id = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for asset_list in executor.map(fetch_chunk, asset_filter_expressions(self.edc_namespace + "id", ids)):
+                for asset_data in asset_list:
+                    if isinstance(asset_data, dict) and (asset_id := asset_data.get('@id')):
+                        assets_by_id[asset_id] = asset_data
+        return assets_by_id
+
+    def delete_asset(self, asset_id: str):
+        """Deletes an asset by its ID using /v3/assets/{asset_id}."""
+        endpoint_path = f"/v3/assets/{asset_id}" # Path relative to management_api_prefix
+        operation_name = f"Delete Asset {asset_id}"
+        logger.info("Attempting to delete asset: %s via %s%s", asset_id, self._api_base, endpoint_path)
+        
+        response_data = self._send_request("DELETE", endpoint_path, operation_name=operation_name)
+        deleted = self._handle_asset_deletion_response(asset_id, response_data)
+        if deleted:
+            self._cache.pop("assets", None)
+        return deleted
+
+    # --- Contract Definition Management --- 
+    def _iter_pages(self, endpoint_path: str, operation_name: str, handler, filter_expr: list = None):
+        """Yields the items handler() extracts from each QuerySpec page of endpoint_path, one page in memory at a time.
+
+        Raises IncompleteListingError if a page after the first one fails.
+        """
+        offset, previous_marker = 0, None
+        while True:
+            response_dict = self._send_request("POST", endpoint_path, json_payload=self._query_spec(offset, filter_expr), operation_name=f"{operation_name} (offset {offset})")
+            self._check_filtered_page(response_dict, filter_expr, operation_name)
+            self._check_later_page(response_dict, offset, operation_name)
+            marker = self._next_page_marker(response_dict)
+            if marker is not None and marker == previous_marker:  # The EDC ignores the offset, do not yield the same items twice
+                self._log_repeated_page(operation_name, offset)
+                return
+            yield from handler(response_dict)
+            if marker is None:  # Last page
+                return
+            previous_marker = marker
+            offset += QUERY_PAGE_SIZE
+
+    def iter_contract_definitions(self, filter_expr: list = None):
+        """Yields the contract definitions from /v2/contractdefinitions/request (all, or those matching the QuerySpec filter_expr), page by page.
+
+        With filter_expr, QueryRejectedError is raised if the EDC does not accept the filter.
+        """
+        endpoint_path = "/v2/contractdefinitions/request"
+        logger.info("Attempting to list contract definitions from %s%s", self._api_base, endpoint_path)
+        return self._iter_pages(endpoint_path, "List Contract Definitions", self._handle_contract_definitions_response, filter_expr)
+
+    def count_contract_definitions(self, limit: int = 1):
+        """Returns the number of contract definitions, counting at most limit (the EDC reports no total), or None on failure."""
+        response_dict = self._send_request("POST", "/v2/contractdefinitions/request", json_payload=self._count_query_spec(limit), operation_name="Count Contract Definitions")
+        return self._count_from_response(response_dict)
+
+    def list_contract_definitions(self, filter_expr: list = None):
+        """Lists the contract definitions like iter_contract_definitions. The unfiltered listing is cached like list_assets."""
+        if filter_expr:
+            return list(self.iter_contract_definitions(filter_expr))
+        return self._cached("contract_definitions", self._fetch_contract_definitions)
+
+    def _fetch_contract_definitions(self):
+        return list(self.iter_contract_definitions())
+
+    def get_raw_contract_definition(self, cd_id: str):
+        """Fetches the raw JSON for a single contract definition by its ID."""
+        endpoint_path = f"/v2/contractdefinitions/{cd_id}"
+        operation_name = f"Get Raw Contract Definition {cd_id}"
+        logger.info("Attempting to get raw contract definition: %s from %s%s", cd_id, self._api_base, endpoint_path)
+        # _send_request returns the parsed JSON directly on success, or an error dict
+        response_data = self._send_request("GET", endpoint_path, operation_name=operation_name)
+        
+        if response_data and not response_data.get("error") and response_data.get("status_code") is None: # Success and has content
+             # if _send_request returns data directly without status_code in a wrapper for GET success
+            return response_data 
+        elif response_data and response_data.get("status_code") and response_data.get("status_code") >= 200 and response_data.get("status_code") < 300:
+            return response_data # It might be wrapped if _send_request changes, but usually direct for GET
+        else:
+            logger.error("Failed to get raw contract definition '%s'. Response: %s", cd_id, response_data)
+            return None
+
+    def delete_contract_definition(self, cd_id: str):
+        """Deletes a contract definition by its ID using /v2/contractdefinitions/{id}."""
+        endpoint_path = f"/v2/contractdefinitions/{cd_id}"
+        operation_name = f"Delete Contract Definition {cd_id}"
+        logger.info("Attempting to delete contract definition: %s via %s%s", cd_id, self._api_base, endpoint_path)
+        response_data = self._send_request("DELETE", endpoint_path, operation_name=operation_name)
+        deleted = self._handle_contract_definition_deletion_response(cd_id, response_data)
+        if deleted:
+            self._cache.pop("contract_definitions", None)
+        return deleted
+
+    # --- Contract Agreement Management ---
+    def iter_contract_agreements(self, filter_expr: list = None):
+        """Yields the contract agreements from /v2/contractagreements/request (all, or those matching filter_expr), page by page.
+
+        With filter_expr, QueryRejectedError is raised if the EDC does not accept the filter.
+        """
+        endpoint_path = "/v2/contractagreements/request"
+        logger.info("Attempting to list contract agreements from %s%s", self._api_base, endpoint_path)
+        return self._iter_pages(endpoint_path, "List Contract Agreements", self._handle_contract_agreements_response, filter_expr)
+
+    def count_contract_agreements(self, limit: int = 1):
+        """Returns the number of contract agreements, counting at most limit (the EDC reports no total), or None on failure."""
+        response_dict = self._send_request("POST", "/v2/contractagreements/request", json_payload=self._count_query_spec(limit), operation_name="Count Contract Agreements")
+        return self._count_from_response(response_dict)
+
+    def list_contract_agreements(self, filter_expr: list = None):
+        """Lists the contract agreements like iter_contract_agreements. The unfiltered listing is cached like list_assets."""
+        if filter_expr:
+            return list(self.iter_contract_agreements(filter_expr))
+        return self._cached("contract_agreements", self._fetch_contract_agreements)
+
+    def _fetch_contract_agreements(self):
+        return list(self.iter_contract_agreements())
+
+    def delete_contract_agreement(self, agreement_id: str):
+        """Deletes a contract agreement by its ID using /v2/contractagreements/{id}."""
+        endpoint_path = f"/v2/contractagreements/{agreement_id}"
+        operation_name = f"Delete Contract Agreement {agreement_id}"
+        logger.info("Attempting to delete contract agreement: %s via %s%s", agreement_id, self._api_base, endpoint_path)
+        response_data = self._send_request("DELETE", endpoint_path, operation_name=operation_name)
+        deleted = self._handle_contract_agreement_deletion_response(agreement_id, response_data)
+        if deleted:
+            self._cache.pop("contract_agreements", None)
+        return deleted
+
+    # --- Bulk Deletion ---
+    def _bulk_delete(self, delete_func, item_ids, max_workers: int, item_label: str):
+        """Runs delete_func for every ID on a thread pool and returns a dict of ID -> success (bool)."""
+        item_ids = list(dict.fromkeys(item_ids))  # De-duplicate, keep order
+        results = {}
+        if not item_ids:
+            return results
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(delete_func, item_id): item_id for item_id in item_ids}
+            for done_count, future in enumerate(as_completed(futures), start=1):
+                item_id = futures[future]
+                try:
+                    results[item_id] = bool(future.result())
+                except Exception as e:
+                    logger.error("Unexpected error while deleting %s '%s': %s", item_label, item_id, e)
+                    results[item_id] = False
+                logger.info("Bulk delete %ss: %s/%s done ('%s': %s).", item_label, done_count, len(item_ids), item_id, 'ok' if results[item_id] else 'failed')
+        self._log_bulk_summary(results, item_label)
+        return results
+
+    def bulk_delete_assets(self, asset_ids, max_workers: int = 8):
+        """Deletes several assets concurrently. Returns a dict of asset ID -> success."""
+        return self._bulk_delete(self.delete_asset, asset_ids, max_workers, "asset")
+
+    def bulk_delete_contract_definitions(self, cd_ids, max_workers: int = 8):
+        """Deletes several contract definitions concurrently. Returns a dict of CD ID -> success."""
+        return self._bulk_delete(self.delete_contract_definition, cd_ids, max_workers, "contract definition")
+
+    def bulk_delete_contract_agreements(self, agreement_ids, max_workers: int = 8):
+        """Deletes several contract agreements concurrently. Returns a dict of CA ID -> success."""
+        return self._bulk_delete(self.delete_contract_agreement, agreement_ids, max_workers, "contract agreement")
+
+
+class AsyncProviderAssetCleaner(_CleanerBase):
+    """asyncio counterpart of ProviderAssetCleaner that runs many requests concurrently.
+
+    Must be used as ``async with AsyncProviderAssetCleaner(...) as cleaner:`` so the HTTP
+    session is created inside the running event loop and closed afterwards.
+    """
+
+    def __init__(self, base_url: str, api_key: str, transport: str = "aiohttp"):
+        """transport selects the HTTP client: "aiohttp" (default) or "httpx" (httpx.AsyncClient, HTTP/2 capable)."""
+        if transport not in ("aiohttp", "httpx"):
+            raise ValueError(f"Unknown transport '{transport}'. Use 'aiohttp' or 'httpx'.")
+        if transport == "aiohttp" and aiohttp is None:
+            raise RuntimeError("AsyncProviderAssetCleaner requires the 'aiohttp' package (pip install aiohttp).")
+        if transport == "httpx" and httpx is None:
+            raise RuntimeError("transport='httpx' requires the 'httpx' package (pip install 'httpx[http2]').")
+        super().__init__(base_url, api_key)
+        self.transport = transport
+        self._session = None
+        self._client = None
+
+    async def __aenter__(self):
+        if self.transport == "httpx":
+            # Over HTTP/2 the concurrent DELETEs of an asset and its CDs/CAs become streams on one connection
+            self._client = httpx.AsyncClient(
+                http2=_httpx_http2_available(),
+                base_url=self._api_base,
+                headers=self.management_headers,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+                timeout=httpx.Timeout(30.0, connect=5.0),
+            )
+            return self
+        self._session = aiohttp.ClientSession(
+            headers=self.management_headers,
+            connector=aiohttp.TCPConnector(limit=32, limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=30),
+            timeout=aiohttp.ClientTimeout(total=30),
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Closes the aiohttp session or httpx client and its pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _send_request(self, method: str, endpoint_path: str, json_payload: dict = None, params: dict = None, operation_name: str = "Operation"):
+        url = self._api_base + endpoint_path
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s - Method: %s, URL: %s, Payload: %s", operation_name, method, url, _json_dumps(json_payload) if json_payload else 'N/A')
+        try:
+            if self._client is not None:
+                response = await self._client.request(method, endpoint_path, params=params, **_request_body_kwargs(json_payload, "content"))
+                logger.info("%s - Status: %s (%s)", operation_name, response.status_code, response.http_version)
+                return self._build_response_dict(response.status_code, response.content, operation_name)
+
+            async with self._session.request(method, url, params=params, **_request_body_kwargs(json_payload)) as response:
+                body = await response.read()
+            logger.info("%s - Status: %s", operation_name, response.status)
+            return self._build_response_dict(response.status, body, operation_name)
+        except _ASYNC_TRANSPORT_ERRORS as e:
+            logger.error("%s - Request Exception: %r", operation_name, e)
+            return {"status": "exception", "status_code": None, "error": str(e), "content": str(e)}
+
+    async def _list_assets_attempt(self, attempt):
+        """Runs one (method, path, payload, params, parser) asset list attempt. Returns the parsed assets, or None."""
+        method, endpoint_path, payload, params, parser = attempt
+        operation_name = f"List Assets ({method} {endpoint_path})"
+        logger.info("Attempting to list assets: %s from %s%s", operation_name, self._api_base, endpoint_path)
+        response_dict = await self._send_request(method, endpoint_path, json_payload=payload, params=params, operation_name=operation_name)
+        assets = self._assets_from_response(response_dict, parser)
+        if assets is not None:
+            logger.info("Found %s assets via %s.", len(assets), operation_name)
+            self._remember_assets_endpoint(attempt)
+            return assets
+        logger.warning("Failed to list assets with %s. Response: %s", operation_name, _LazyStr(lambda: str(response_dict)[:300]))
+        return None
+
+    async def list_assets(self):
+        """Lists all assets like ProviderAssetCleaner.list_assets, but races the two QuerySpec POST endpoints."""
+        attempts = self._asset_list_attempts()
+        if self._assets_endpoint is not None:
+            assets = await self._list_assets_attempt(self._assets_endpoint)
+            if assets is not None:
+                return assets
+            attempts = [attempt for attempt in attempts if attempt[:2] != self._assets_endpoint[:2]]
+
+        # The POST /request endpoints are read-only, so they are tried at once and the first list wins;
+        # the GET endpoints are probed one after another around them, in table order
+        posts = [attempt for attempt in attempts if attempt[0] == "POST"]
+        for attempt in attempts:
+            if attempt[0] == "GET":
+                assets = await self._list_assets_attempt(attempt)
+                if assets is not None:
+                    return assets
+            elif attempt is posts[0]:
+                racers = [asyncio.ensure_future(self._list_assets_attempt(post)) for post in posts]
+                try:
+                    for next_done in asyncio.as_completed(racers):
+                        assets = await next_done
+                        if assets is not None:
+                            return assets
+                finally:
+                    for racer in racers:
+                        racer.cancel()
+
+        logger.error("Could not retrieve assets with any attempted method (/v3/assets GET, /v3/assets/request POST, /v2/assets/request POST, /v2/assets GET). Please check EDC logs for supported endpoints.")
+        return []
+
+    async def delete_asset(self, asset_id: str):
+        """Deletes an asset by its ID using /v3/assets/{asset_id}."""
+        endpoint_path = f"/v3/assets/{asset_id}"
+        logger.info("Attempting to delete asset: %s via %s%s", asset_id, self._api_base, endpoint_path)
+        response_data = await self._send_request("DELETE", endpoint_path, operation_name=f"Delete Asset {asset_id}")
+        return self._handle_asset_deletion_response(asset_id, response_data)
+
+    async def _iter_pages(self, endpoint_path: str, operation_name: str, handler, filter_expr: list = None):
+        """Async generator over the items of each QuerySpec page; page N+1 is downloaded while page N is consumed.
+
+        Raises IncompleteListingError if a page after the first one fails.
+        """
+        def fetch(offset):
+            return asyncio.ensure_future(self._send_request("POST", endpoint_path, json_payload=self._query_spec(offset, filter_expr), operation_name=f"{operation_name} (offset {offset})"))
+
+        offset, previous_marker = 0, None
+        pending = fetch(offset)
+        try:
+            while pending is not None:
+                response_dict = await pending
+                pending = None
+                self._check_filtered_page(response_dict, filter_expr, operation_name)
+                self._check_later_page(response_dict, offset, operation_name)
+                marker = self._next_page_marker(response_dict)
+                if marker is not None and marker == previous_marker:  # The EDC ignores the offset, do not yield the same items twice
+                    self._log_repeated_page(operation_name, offset)
+                    return
+                if marker is not None:  # Full page, another one may follow
+                    pending = fetch(offset + QUERY_PAGE_SIZE)
+                previous_marker = marker
+                for item in handler(response_dict):
+                    yield item
+                offset += QUERY_PAGE_SIZE
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    def iter_contract_definitions(self, filter_expr: list = None):
+        """Async generator over the contract definitions from /v2/contractdefinitions/request (all, or those matching filter_expr)."""
+        endpoint_path = "/v2/contractdefinitions/request"
+        logger.info("Attempting to list contract definitions from %s%s", self._api_base, endpoint_path)
+        return self._iter_pages(endpoint_path, "List Contract Definitions", self._handle_contract_definitions_response, filter_expr)
+
+    async def count_contract_definitions(self, limit: int = 1):
+        """Returns the number of contract definitions, counting at most limit, or None on failure."""
+        response_dict = await self._send_request("POST", "/v2/contractdefinitions/request", json_payload=self._count_query_spec(limit), operation_name="Count Contract Definitions")
+        return self._count_from_response(response_dict)
+
+    async def list_contract_definitions(self, filter_expr: list = None):
+        """Lists the contract definitions using /v2/contractdefinitions/request; raises QueryRejectedError for a rejected filter_expr."""
+        return [cd async for cd in self.iter_contract_definitions(filter_expr)]
+
+    async def get_raw_contract_definition(self, cd_id: str):
+        """Fetches the raw JSON for a single contract definition by its ID (for --debug), or None on failure."""
+        endpoint_path = f"/v2/contractdefinitions/{cd_id}"
+        logger.info("Attempting to get raw contract definition: %s from %s%s", cd_id, self._api_base, endpoint_path)
+        response_data = await self._send_request("GET", endpoint_path, operation_name=f"Get Raw Contract Definition {cd_id}")
+        status_code = response_data.get("status_code") if response_data else None
+        if status_code and 200 <= status_code < 300:
+            return response_data  # Wrapped like the sync cleaner's result, so --debug prints the same structure
+        logger.error("Failed to get raw contract definition '%s'. Response: %s", cd_id, response_data)
+        return None
+
+    async def delete_contract_definition(self, cd_id: str):
+        """Deletes a contract definition by its ID using /v2/contractdefinitions/{id}."""
+        endpoint_path = f"/v2/contractdefinitions/{cd_id}"
+        logger.info("Attempting to delete contract definition: %s via %s%s", cd_id, self._api_base, endpoint_path)
+        response_data = await self._send_request("DELETE", endpoint_path, operation_name=f"Delete Contract Definition {cd_id}")
+        return self._handle_contract_definition_deletion_response(cd_id, response_data)
+
+    def iter_contract_agreements(self, filter_expr: list = None):
+        """Async generator over the contract agreements from /v2/contractagreements/request (all, or those matching filter_expr)."""
+        endpoint_path = "/v2/contractagreements/request"
+        logger.info("Attempting to list contract agreements from %s%s", self._api_base, endpoint_path)
+        return self._iter_pages(endpoint_path, "List Contract Agreements", self._handle_contract_agreements_response, filter_expr)
+
+    async def count_contract_agreements(self, limit: int = 1):
+        """Returns the number of contract agreements, counting at most limit, or None on failure."""
+        response_dict = await self._send_request("POST", "/v2/contractagreements/request", json_payload=self._count_query_spec(limit), operation_name="Count Contract Agreements")
+        return self._count_from_response(response_dict)
+
+    async def list_contract_agreements(self, filter_expr: list = None):
+        """Lists the contract agreements using /v2/contractagreements/request; raises QueryRejectedError for a rejected filter_expr."""
+        return [ca async for ca in self.iter_contract_agreements(filter_expr)]
+
+    async def delete_contract_agreement(self, agreement_id: str):
+        """Deletes a contract agreement by its ID using /v2/contractagreements/{id}."""
+        endpoint_path = f"/v2/contractagreements/{agreement_id}"
+        logger.info("Attempting to delete contract agreement: %s via %s%s", agreement_id, self._api_base, endpoint_path)
+        response_data = await self._send_request("DELETE", endpoint_path, operation_name=f"Delete Contract Agreement {agreement_id}")
+        return self._handle_contract_agreement_deletion_response(agreement_id, response_data)
+
+    # --- Bulk Deletion ---
+    async def _bulk_delete(self, delete_func, item_ids, item_label: str):
+        """Runs delete_func for all IDs concurrently and returns a dict of ID -> success (bool)."""
+        item_ids = list(dict.fromkeys(item_ids))  # De-duplicate, keep order
+        outcomes = await asyncio.gather(*(delete_func(item_id) for item_id in item_ids), return_exceptions=True)
+        results = {}
+        for item_id, outcome in zip(item_ids, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error("Unexpected error while deleting %s '%s': %r", item_label, item_id, outcome)
+                results[item_id] = False
+            else:
+                results[item_id] = bool(outcome)
+        if results:
+            self._log_bulk_summary(results, item_label)
+        return results
+
+    async def bulk_delete_assets(self, asset_ids):
+        """Deletes several assets concurrently. Returns a dict of asset ID -> success."""
+        return await self._bulk_delete(self.delete_asset, asset_ids, "asset")
+
+    async def bulk_delete_contract_definitions(self, cd_ids):
+        """Deletes several contract definitions concurrently. Returns a dict of CD ID -> success."""
+        return await self._bulk_delete(self.delete_contract_definition, cd_ids, "contract definition")
+
+    async def bulk_delete_contract_agreements(self, agreement_ids):
+        """Deletes several contract agreements concurrently. Returns a dict of CA ID -> success."""
+        return await self._bulk_delete(self.delete_contract_agreement, agreement_ids, "contract agreement")
+
+    async def delete_all(self, selected_assets: list, cd_index: dict, ca_index: dict, max_concurrency: int = 8):
+        """Deletes the selected assets together with their contract definitions and agreements.
+
+        cd_index and ca_index map an asset ID to the IDs of the CDs/CAs referencing it. All assets are
+        processed concurrently; per asset, its CDs and CAs are deleted first, then the asset itself.
+        At most max_concurrency DELETEs are in flight at once. Returns the (asset, CD, CA) dicts of ID -> success.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))  # Like the sync path, --parallel 0 still deletes one at a time
+        asset_results, cd_results, ca_results = {}, {}, {}
+
+        async def bounded_delete(delete_func, item_id, results, item_label):
+            async with semaphore:
+                try:
+                    results[item_id] = bool(await delete_func(item_id))
+                except Exception as e:
+                    logger.error("Unexpected error while deleting %s '%s': %r", item_label, item_id, e)
+                    results[item_id] = False
+
+        async def delete_with_dependencies(asset_id, cd_ids, ca_ids):
+            await asyncio.gather(
+                *(bounded_delete(self.delete_contract_definition, cd_id, cd_results, "contract definition") for cd_id in cd_ids),
+                *(bounded_delete(self.delete_contract_agreement, ca_id, ca_results, "contract agreement") for ca_id in ca_ids),
+            )
+            await bounded_delete(self.delete_asset, asset_id, asset_results, "asset")
+
+        # A CD or CA shared by several assets is deleted once, by the first asset referencing it
+        asset_ids = list(dict.fromkeys(asset.get('@id') for asset in selected_assets))
+        cd_claims = claim_related_ids(asset_ids, cd_index)
+        ca_claims = claim_related_ids(asset_ids, ca_index)
+        await asyncio.gather(*(delete_with_dependencies(asset_id, cd_claims[asset_id], ca_claims[asset_id]) for asset_id in asset_ids))
+
+        for results, item_label in ((cd_results, "contract definition"), (ca_results, "contract agreement"), (asset_results, "asset")):
+            if results:
+                self._log_bulk_summary(results, item_label)
+        return asset_results, cd_results, ca_results
+
+def _parse_selection(choice_str: str):
+    """Splits a selection input like '1, 3-5' into 'A', 'N' and (first, last) number tuples. Raises ValueError on anything else."""
+    tokens, pos = [], 0
+    for match in _SELECT_TOKEN.finditer(choice_str):
+        if match.start() != pos:
+            raise ValueError(choice_str)
+        letter, first, last, separator = match.groups()
+        if letter:
+            tokens.append(letter)
+        elif first:
+            low, high = sorted((int(first), int(last or first)))
+            tokens.append((low, high))
+        pos = match.end()
+        if not separator:  # Matched the end of the input
+            break
+    if pos != len(choice_str):
+        raise ValueError(choice_str)
+    return tokens
+
+
+def _iter_set_bits(bits: int):
+    """Yields the positions of the set bits of bits, lowest first."""
+    while bits:
+        lowest_bit = bits & -bits
+        yield lowest_bit.bit_length() - 1
+        bits ^= lowest_bit
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_env(path: str):
+    """Parses the .env file at path once. Returns its values, without the keys that have none."""
+    return {key: value for key, value in dotenv_values(path).items() if value is not None}
+
+
+def _load_env(path: str):
+    """Applies the .env file at path to os.environ on every call (like load_dotenv(override=True)). Returns the values."""
+    values = _parse_env(path)
+    os.environ.update(values)
+    return values
+
+
+def get_user_selection(assets: list, quiet: bool = False):
+    """Asks for the assets to delete. With quiet, only the number of selected assets is shown after each input."""
     if not assets:
         logger.info("No assets found to select for deletion.")
         return []
 
+    asset_ids = [asset.get('@id') for asset in assets]
     print("\nAvailable assets for deletion:")
     for i, asset in enumerate(assets):
-        print(f"  {i+1}. ID: {asset.get('@id')} (Name: {asset.get('name', 'N/A')})")
+        print(f"  {i+1}. ID: {asset_ids[i]} (Name: {asset.get('name', 'N/A')})")
     
-    selected_indices = set()
+    all_bits = (1 << len(assets)) - 1
+    selected_bits = 0  # Bit i set = assets[i] selected
     while True:
         try:
-            choice_str = input("Select assets to delete by number (e.g., 1,3,5), 'A' for All, 'N' for None, then press Enter: ").strip().upper()
+            choice_str = input("Select assets to delete by number or range (e.g., 1,3,5-7), 'A' for All, 'N' for None, then press Enter: ").strip().upper()
             if not choice_str: # User pressed Enter
-                if not selected_indices:
+                if not selected_bits:
                     print("No assets selected. Type 'N' if you want to select none, or provide numbers.")
                     continue
                 break
 
             if choice_str == 'A':
-                selected_indices = set(range(len(assets)))
+                selected_bits = all_bits
                 print(f"All {len(assets)} assets selected.")
                 break 
             if choice_str == 'N':
-                selected_indices = set()
+                selected_bits = 0
                 print("No assets selected.")
                 break
 
             # Clear previous partial selections if new input is given
-            current_selection_this_รอบ = set()
-            parts = choice_str.split(',')
-            valid_choice_made = False
-            for part in parts:
-                part = part.strip()
-                if not part: continue
-                if part.upper() == 'A':
-                    current_selection_this_รอบ.update(range(len(assets)))
-                    valid_choice_made = True
-                    continue
-                if part.upper() == 'N':
-                    current_selection_this_รอบ.clear() # N overrides others in this specific input
-                    valid_choice_made = True
-                    break 
-                
-                choice_num = int(part) -1
-                if 0 <= choice_num < len(assets):
-                    current_selection_this_รอบ.add(choice_num)
-                    valid_choice_made = True
-                else:
-                    print(f"Invalid selection: '{part}'. Number out of range.")
-            
-            if valid_choice_made :
-                 # Update main selection: user can toggle by re-entering
-                 for idx_to_toggle in current_selection_this_รอบ:
-                     if idx_to_toggle in selected_indices:
-                         selected_indices.remove(idx_to_toggle)
-                     else:
-                         selected_indices.add(idx_to_toggle)
-
-            if selected_indices:
+            tokens = _parse_selection(choice_str)
+            if 'N' in tokens:
+                current_bits = 0 # N overrides others in this specific input
+            elif 'A' in tokens:
+                current_bits = all_bits
+            else:
+                current_bits = 0
+                for first, last in tokens:
+                    label = str(first) if first == last else f"{first}-{last}"
+                    if first < 1 or last > len(assets):
+                        print(f"Invalid selection: '{label}'. Number out of range.")
+                        first, last = max(first, 1), min(last, len(assets))
+                    if first <= last:
+                        current_bits |= ((1 << (last - first + 1)) - 1) << (first - 1)
+
+            # Update main selection: user can toggle by re-entering
+            selected_bits ^= current_bits
+
+            if selected_bits and quiet:
+                print(f"{bin(selected_bits).count('1')} asset(s) currently selected for deletion.")
+            elif selected_bits:
                 print("Currently selected for deletion:")
-                for i in sorted(list(selected_indices)):
-                     print(f"  - {assets[i].get('@id')}")
+                for i in _iter_set_bits(selected_bits):
+                    print(f"  - {asset_ids[i]}")
             else:
                 print("No assets currently selected.")
 
         except ValueError:
-            print("Invalid input. Please enter numbers, 'A', or 'N'.")
+            print("Invalid input. Please enter numbers, ranges like '3-7', 'A', or 'N'.")
         except KeyboardInterrupt:
             print("\nSelection cancelled by user.")
             return []
             
-    return [assets[i] for i in selected_indices]
+    return [assets[i] for i in _iter_set_bits(selected_bits)]
 
 
 def main():
@@ -549,15 +1282,65 @@ def main():
         action="store_true",
         help="Automatically confirm deletions without prompting.",
     )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Enable DEBUG logging, including the request payloads and a dump of the first contract definition/agreement.",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Only show the number of selected assets after each selection input, not their IDs (for large asset lists).",
+    )
+    parser.add_argument(
+        "--parallel",
+        "--concurrency",
+        dest="parallel",
+        type=int,
+        default=8,
+        metavar="N",
+        help="Number of assets (with their CDs/CAs) deleted concurrently (default: 8). Use 1 for sequential deletion.",
+    )
+    parser.add_argument(
+        "--transport",
+        choices=("requests", "httpx"),
+        default="requests",
+        help="HTTP client: 'requests' (default; aiohttp with --async) or 'httpx' (HTTP/2, requires httpx[http2]).",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Run all HTTP calls concurrently on an asyncio event loop (requires aiohttp).",
+    )
+    parser.add_argument(
+        "--skip-deps",
+        action="store_true",
+        help="Delete only the selected assets, without looking up or deleting their contract definitions/agreements.",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=60,
+        metavar="SECONDS",
+        help="Reuse contract definition/agreement listings fetched by a previous run within this many seconds (default: 60).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always fetch contract definitions and agreements from the EDC (the fresh listings are still cached).",
+    )
     args = parser.parse_args()
+    if args.debug:
+        logger.setLevel(logging.DEBUG)
 
     env_full_path = os.path.abspath(args.env)
     if not os.path.exists(env_full_path):
-        logger.error(f"Environment file not found: {env_full_path}")
+        logger.error("Environment file not found: %s", env_full_path)
         sys.exit(1)
     
-    logger.info(f"Loading environment from: {env_full_path}")
-    load_dotenv(env_full_path, override=True)
+    logger.info("Loading environment from: %s", env_full_path)
+    _load_env(env_full_path)
 
     # These should be set in the .env file loaded
     base_url = os.getenv("BASE_URL")
@@ -570,120 +1353,384 @@ def main():
         logger.error("CRITICAL: API_KEY environment variable not set in the .env file.")
         sys.exit(1)
 
-    cleaner = ProviderAssetCleaner(base_url=base_url, api_key=api_key)
-    
-    assets_to_list = cleaner.list_assets()
+    if args.transport == "httpx" and httpx is None:
+        logger.error("CRITICAL: --transport httpx requires the 'httpx' package. Install it with \"pip install 'httpx[http2]'\".")
+        sys.exit(1)
+
+    if args.use_async and args.transport != "httpx" and aiohttp is None:
+        logger.error("CRITICAL: --async requires the 'aiohttp' package (or --transport httpx). Install it with 'pip install aiohttp'.")
+        sys.exit(1)
+
+    try:
+        if args.use_async:
+            asyncio.run(main_async(base_url, api_key, args))
+            return
+
+        # Size the pool for --parallel, so every worker thread keeps its connection alive instead of reconnecting
+        with create_session(pool_maxsize=max(64, args.parallel)) as session, \
+                ProviderAssetCleaner(base_url=base_url, api_key=api_key, transport=args.transport, session=session) as cleaner:
+            run_cleanup(cleaner, args)
+    except IncompleteListingError as e:
+        # Raised while listing the dependencies, before anything is deleted
+        logger.error("CRITICAL: %s. Nothing was deleted.", e)
+        sys.exit(1)
+
+
+def select_assets_for_deletion(assets_to_list: list, args: argparse.Namespace):
+    """Asks the user which assets to delete and for confirmation. Returns [] if nothing should be deleted."""
     if not assets_to_list:
         logger.info("No assets found on the provider to manage.")
-        return
+        return []
 
-    selected_assets = get_user_selection(assets_to_list)
+    selected_assets = get_user_selection(assets_to_list, quiet=args.quiet)
 
     if not selected_assets:
         logger.info("No assets were selected for deletion.")
-        return
+        return []
 
     logger.info("\nThe following assets are selected for DELETION:")
     for asset in selected_assets:
-        logger.info(f"  - ID: {asset.get('@id')} (Name: {asset.get('name')})")
+        logger.info("  - ID: %s (Name: %s)", asset.get('@id'), asset.get('name'))
     
     if not args.yes:
         confirm = input("\nAre you sure you want to delete these assets (and their directly related contract definitions AND contract agreements)? This action CANNOT be undone. (yes/no): ").strip().lower()
         if confirm != 'yes':
             logger.info("Deletion cancelled by user.")
-            return
+            return []
+    return selected_assets
 
-    logger.info("\n--- Fetching all contract definitions to check dependencies ---")
-    all_contract_definitions = cleaner.list_contract_definitions()
 
-    # ---- DEBUG: Print first CD (processed and raw) ----
-    if all_contract_definitions:
-        logger.info("\n--- DEBUG: First Contract Definition (Processed) ---")
-        logger.info(f"CD 1 (Processed): {json.dumps(all_contract_definitions[0], indent=2)}")
-        first_cd_id_debug = all_contract_definitions[0].get('@id')
-        if first_cd_id_debug:
-            logger.info("\n--- DEBUG: RAW structure of first Contract Definition ---")
-            raw_cd_data_debug = cleaner.get_raw_contract_definition(first_cd_id_debug)
-            if raw_cd_data_debug:
-                logger.info(f"CD 1 (RAW from GET {first_cd_id_debug}): {json.dumps(raw_cd_data_debug, indent=2)}")
-    # ---- END DEBUG ----
+def index_related_ids(items: list, key: str):
+    """Maps each value of items[...][key] to the list of @ids of the items carrying it, so lookups per asset are O(1)."""
+    index = collections.defaultdict(list)
+    for item in items:
+        index[item.get(key)].append(item.get('@id'))
+    return index
 
-    logger.info("\n--- Fetching all contract agreements to check dependencies ---")
-    all_contract_agreements = cleaner.list_contract_agreements()
 
-    # ---- DEBUG: Print first CA if available ----
-    if all_contract_agreements:
-        logger.info("\n--- DEBUG: First Contract Agreement (Processed) ---")
-        logger.info(f"CA 1 (Processed): {json.dumps(all_contract_agreements[0], indent=2)}")
+def claim_related_ids(asset_ids, index: dict):
+    """Narrows an index_related_ids map to the given assets; an item shared by several assets goes to the first one only."""
+    claimed, seen_ids = {}, set()
+    for asset_id in asset_ids:
+        claimed[asset_id] = [item_id for item_id in index.get(asset_id, ()) if item_id not in seen_ids]
+        seen_ids.update(claimed[asset_id])
+    return claimed
+
+
+def process_asset(asset: dict, cds_by_target: dict, cas_by_asset: dict, cleaner: ProviderAssetCleaner):
+    """Deletes the CDs, then the CAs, then the asset itself. Returns (asset deleted, CD results, CA results), with ID -> success dicts."""
+    asset_id = asset.get('@id')
+
+    related_cd_ids = cds_by_target.get(asset_id, [])
+    if related_cd_ids:
+        logger.info("Found contract definition(s) %s targeting asset '%s'. They will be deleted.", related_cd_ids, asset_id)
     else:
-        logger.info("\n--- DEBUG: No contract agreements found or processed ---")
-    # ---- END DEBUG ----
+        logger.info("No specific contract definitions found directly targeting asset '%s'.", asset_id)
+    delete_contract_definition = cleaner.delete_contract_definition
+    cd_results = {cd_id: delete_contract_definition(cd_id) for cd_id in related_cd_ids}
+    if not all(cd_results.values()):
+        logger.warning("Some contract definitions of asset '%s' could not be deleted. Deleting the asset might still be blocked.", asset_id)
 
-    deleted_assets_count = 0
-    failed_assets_count = 0
-    deleted_cds_count = 0
-    failed_cds_count = 0
-    deleted_cas_count = 0 # Contract Agreements deleted
-    failed_cas_count = 0  # Contract Agreements failed to delete
+    # The assetId in the agreement should match the asset_id we are trying to delete.
+    # Note: list_contract_agreements tries to populate ca.get('assetId') correctly.
+    related_ca_ids = cas_by_asset.get(asset_id, [])
+    if related_ca_ids:
+        logger.info("Found contract agreement(s) %s for asset '%s'. They will be deleted.", related_ca_ids, asset_id)
+    else:
+        logger.info("No contract agreements found directly referencing asset '%s'.", asset_id)
+    delete_contract_agreement = cleaner.delete_contract_agreement
+    ca_results = {ca_id: delete_contract_agreement(ca_id) for ca_id in related_ca_ids}
+    if not all(ca_results.values()):
+        # The delete_contract_agreement method logs specifics, including 405
+        logger.warning("Some contract agreements of asset '%s' could not be deleted. Deleting the asset will likely be blocked.", asset_id)
 
-    for asset in selected_assets:
-        asset_id = asset.get('@id')
-        logger.info(f"\n--- Processing asset for deletion: {asset_id} ---")
-
-        # Step 1: Attempt to delete dependent contract definitions for this asset
-        logger.info(f"Checking for contract definitions targeting asset: {asset_id}")
-        found_related_cd = False
-        for cd in all_contract_definitions:
-            if cd.get('assetsSelectorTarget') == asset_id:
-                found_related_cd = True
-                logger.info(f"Found contract definition '{cd.get('@id')}' targeting asset '{asset_id}'. Attempting to delete it.")
-                if cleaner.delete_contract_definition(cd.get('@id')):
-                    deleted_cds_count += 1
-                else:
-                    failed_cds_count += 1
-                    logger.warning(f"Failed to delete contract definition '{cd.get('@id')}' for asset '{asset_id}'. Asset deletion might still be blocked.")
-        if not found_related_cd:
-            logger.info(f"No specific contract definitions found directly targeting asset '{asset_id}'.")
-
-        # Step 2: Attempt to delete dependent contract agreements for this asset
-        logger.info(f"Checking for contract agreements related to asset: {asset_id}")
-        found_related_ca = False
-        for ca in all_contract_agreements:
-            # The assetId in the agreement should match the asset_id we are trying to delete.
-            # Note: list_contract_agreements tries to populate ca.get('assetId') correctly.
-            if ca.get('assetId') == asset_id:
-                found_related_ca = True
-                logger.info(f"Found contract agreement '{ca.get('@id')}' for asset '{asset_id}'. Attempting to delete it.")
-                if cleaner.delete_contract_agreement(ca.get('@id')):
-                    deleted_cas_count += 1
-                else:
-                    failed_cas_count += 1
-                    # The delete_contract_agreement method now logs specifics, including 405
-                    logger.warning(f"Failed to delete contract agreement '{ca.get('@id')}' for asset '{asset_id}'. Asset deletion will likely be blocked if this CA was the cause.")
-        if not found_related_ca:
-            logger.info(f"No contract agreements found directly referencing asset '{asset_id}'.")
-
-        # Step 3: Attempt to delete the asset itself
-        logger.info(f"Attempting to delete asset: {asset_id} (after CD and CA cleanup attempts)")
-        if cleaner.delete_asset(asset_id):
-            deleted_assets_count += 1
-        else:
-            failed_assets_count += 1
-    
-    logger.info(f"\n--- Deletion Summary ---")
-    logger.info(f"Successfully deleted: {deleted_assets_count} asset(s)")
+    return cleaner.delete_asset(asset_id), cd_results, ca_results
+
+
+def _list_cache_path(base_url: str, name: str):
+    # Normalized like _CleanerBase.base_url, so a BASE_URL with or without a trailing '/' maps to the same file
+    key = hashlib.sha256(f"{base_url.rstrip('/')}\0{name}".encode()).hexdigest()[:32]
+    return os.path.join(LIST_CACHE_DIR, f"{key}.json")
+
+
+def load_cached_list(base_url: str, name: str, ttl: float):
+    """Returns the listing stored by store_cached_list if it is younger than ttl seconds, else None."""
+    if ttl <= 0:
+        return None
+    try:
+        with open(_list_cache_path(base_url, name), "rb") as f:
+            entry = _json_loads(f.read())
+        if time.time() - entry["ts"] < ttl and isinstance(entry["data"], list):
+            logger.info("Using cached %s listing (%.0fs old, --cache-ttl %s).", name, time.time() - entry["ts"], ttl)
+            return entry["data"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def store_cached_list(base_url: str, name: str, data: list):
+    """Stores a non-empty listing for load_cached_list. Failing to write the cache is not an error."""
+    if not data:
+        return
+    try:
+        os.makedirs(LIST_CACHE_DIR, exist_ok=True)
+        with open(_list_cache_path(base_url, name), "w") as f:
+            f.write(_json_dumps({"ts": time.time(), "data": data}))
+    except OSError as e:
+        logger.debug("Could not write %s listing cache: %s", name, e)
+
+
+def prune_cached_list(base_url: str, name: str, results: dict):
+    """Removes the items deleted successfully (per an ID -> success dict) from a cached listing, keeping its age."""
+    deleted_ids = {item_id for item_id, ok in results.items() if ok}
+    if not deleted_ids:
+        return
+    path = _list_cache_path(base_url, name)
+    try:
+        with open(path, "rb") as f:
+            entry = _json_loads(f.read())
+        entry["data"] = [item for item in entry["data"] if item.get('@id') not in deleted_ids]
+        with open(path, "w") as f:
+            f.write(_json_dumps(entry))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        # A listing that cannot be updated must not be reused
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def asset_filter_expressions(operand_left: str, asset_ids: list):
+    """Yields QuerySpec filterExpressions matching operand_left against the asset IDs, ASSET_FILTER_BATCH_SIZE IDs each."""
+    for chunk in _chunked(dict.fromkeys(asset_ids), ASSET_FILTER_BATCH_SIZE):
+        yield [{"operandLeft": operand_left, "operator": "in", "operandRight": chunk}]
+
+
+def list_unless_empty(count_fn, list_fn):
+    """Returns list_fn(), or [] without the full listing if the count_fn() probe reports no items at all."""
+    if count_fn() == 0:
+        logger.info("The EDC has no items for %s(), skipping the full listing.", getattr(list_fn, "__name__", list_fn))
+        return []
+    return list_fn()
+
+
+async def list_unless_empty_async(count_fn, list_fn):
+    """Coroutine variant of list_unless_empty for async count_fn and list_fn."""
+    if await count_fn() == 0:
+        logger.info("The EDC has no items for %s(), skipping the full listing.", getattr(list_fn, "__name__", list_fn))
+        return []
+    return await list_fn()
+
+
+def cached_list(base_url: str, name: str, fn, ttl: float, filtered_fn=None):
+    """Returns the cached listing `name` for base_url, or calls fn() and caches its result.
+
+    If filtered_fn is given and the cache is cold, its (uncached) result is returned instead, unless it raises
+    QueryRejectedError; then the full listing is fetched.
+    """
+    data = load_cached_list(base_url, name, ttl)
+    if data is None and filtered_fn is not None:
+        try:
+            return filtered_fn()
+        except QueryRejectedError as e:
+            logger.warning("%s. Falling back to listing all %s.", e, name)
+    if data is None:
+        data = fn()
+        store_cached_list(base_url, name, data)
+    return data
+
+
+async def cached_list_async(base_url: str, name: str, fn, ttl: float, filtered_fn=None):
+    """Coroutine variant of cached_list for async fn and filtered_fn."""
+    data = load_cached_list(base_url, name, ttl)
+    if data is None and filtered_fn is not None:
+        try:
+            return await filtered_fn()
+        except QueryRejectedError as e:
+            logger.warning("%s. Falling back to listing all %s.", e, name)
+    if data is None:
+        data = await fn()
+        store_cached_list(base_url, name, data)
+    return data
+
+
+def log_deletion_summary(asset_results: dict, cd_results: dict, ca_results: dict):
+    """Logs the final summary given the ID -> success dicts of the three deletion phases."""
+    deleted_assets_count = sum(asset_results.values())
+    failed_assets_count = len(asset_results) - deleted_assets_count
+    deleted_cds_count = sum(cd_results.values())
+    failed_cds_count = len(cd_results) - deleted_cds_count
+    deleted_cas_count = sum(ca_results.values()) # Contract Agreements deleted
+    failed_cas_count = len(ca_results) - deleted_cas_count  # Contract Agreements failed to delete
+
+    logger.info("\n--- Deletion Summary ---")
+    logger.info("Successfully deleted: %s asset(s)", deleted_assets_count)
     if failed_assets_count > 0:
-        logger.warning(f"Failed to delete: {failed_assets_count} asset(s)")
-    logger.info(f"Successfully deleted: {deleted_cds_count} contract definition(s)")
+        logger.warning("Failed to delete: %s asset(s)", failed_assets_count)
+    logger.info("Successfully deleted: %s contract definition(s)", deleted_cds_count)
     if failed_cds_count > 0:
-        logger.warning(f"Failed to delete: {failed_cds_count} contract definition(s)")
-    logger.info(f"Successfully deleted: {deleted_cas_count} contract agreement(s)")
+        logger.warning("Failed to delete: %s contract definition(s)", failed_cds_count)
+    logger.info("Successfully deleted: %s contract agreement(s)", deleted_cas_count)
     if failed_cas_count > 0:
-        logger.warning(f"Failed to delete: {failed_cas_count} contract agreement(s)")
+        logger.warning("Failed to delete: %s contract agreement(s)", failed_cas_count)
     
     logger.info("Asset cleanup process finished.")
     logger.warning("Note: This script attempts to delete assets, their targeting contract definitions, and related contract agreements.")
     logger.warning("Assets referenced by contract agreements that could not be deleted (e.g., due to EDC restrictions like 405 Method Not Allowed on agreement deletion) will remain on the provider.")
 
+
+def log_first_contract_definition(contract_definitions: list, raw_cd_data):
+    """--debug dump of the first processed contract definition and raw_cd_data, its raw JSON from GET (or None)."""
+    logger.debug("\n--- DEBUG: First Contract Definition (Processed) ---")
+    logger.debug("CD 1 (Processed): %s", _LazyStr(lambda: _json_dumps(contract_definitions[0], indent=True)))
+    first_cd_id = contract_definitions[0].get('@id')
+    if first_cd_id:
+        logger.debug("\n--- DEBUG: RAW structure of first Contract Definition ---")
+        if raw_cd_data:
+            logger.debug("CD 1 (RAW from GET %s): %s", first_cd_id, _LazyStr(lambda: _json_dumps(raw_cd_data, indent=True)))
+
+
+def log_first_contract_agreement(contract_agreements: list):
+    """--debug dump of the first processed contract agreement."""
+    if contract_agreements:
+        logger.debug("\n--- DEBUG: First Contract Agreement (Processed) ---")
+        logger.debug("CA 1 (Processed): %s", _LazyStr(lambda: _json_dumps(contract_agreements[0], indent=True)))
+    else:
+        logger.debug("\n--- DEBUG: No contract agreements found or processed ---")
+
+
+def fetch_dependencies(cleaner: ProviderAssetCleaner, selected_asset_ids: list, args: argparse.Namespace):
+    """Returns the (contract definitions, contract agreements) that may reference the selected assets."""
+    # Ask the EDC only for the CDs/CAs of the selected assets; a fresh cached full listing or a rejected filter uses the full listing
+    cache_ttl = 0 if args.no_cache else args.cache_ttl
+
+    logger.info("\n--- Fetching contract definitions to check dependencies ---")
+    all_contract_definitions = cached_list(
+        cleaner.base_url, "contract_definitions", lambda: list_unless_empty(cleaner.count_contract_definitions, cleaner.list_contract_definitions), cache_ttl,
+        filtered_fn=lambda: [cd for filter_expr in asset_filter_expressions(CD_ASSET_FILTER_OPERAND, selected_asset_ids)
+                             for cd in cleaner.list_contract_definitions(filter_expr)],
+    )
+
+    # ---- DEBUG: Print first CD (processed and raw) ----
+    if args.debug and logger.isEnabledFor(logging.DEBUG) and all_contract_definitions:
+        first_cd_id_debug = all_contract_definitions[0].get('@id')
+        log_first_contract_definition(all_contract_definitions, first_cd_id_debug and cleaner.get_raw_contract_definition(first_cd_id_debug))
+    # ---- END DEBUG ----
+
+    logger.info("\n--- Fetching contract agreements to check dependencies ---")
+    all_contract_agreements = cached_list(
+        cleaner.base_url, "contract_agreements", lambda: list_unless_empty(cleaner.count_contract_agreements, cleaner.list_contract_agreements), cache_ttl,
+        filtered_fn=lambda: [ca for filter_expr in asset_filter_expressions(CA_ASSET_FILTER_OPERAND, selected_asset_ids)
+                             for ca in cleaner.list_contract_agreements(filter_expr)],
+    )
+
+    # ---- DEBUG: Print first CA if available ----
+    if args.debug and logger.isEnabledFor(logging.DEBUG):
+        log_first_contract_agreement(all_contract_agreements)
+    # ---- END DEBUG ----
+
+    return all_contract_definitions, all_contract_agreements
+
+
+def run_cleanup(cleaner: ProviderAssetCleaner, args: argparse.Namespace):
+    """Lists assets, asks for a selection and deletes the selected assets with their dependencies."""
+    selected_assets = select_assets_for_deletion(cleaner.list_assets(), args)
+    if not selected_assets:
+        return
+
+    selected_asset_ids = [asset.get('@id') for asset in selected_assets]
+    if args.skip_deps:
+        logger.info("\n--- Skipping contract definitions and agreements (--skip-deps) ---")
+        all_contract_definitions, all_contract_agreements = [], []
+    else:
+        all_contract_definitions, all_contract_agreements = fetch_dependencies(cleaner, selected_asset_ids, args)
+
+    # Index the dependencies once so each selected asset is a dict lookup instead of a scan over all CDs/CAs
+    cds_by_target = index_related_ids(all_contract_definitions, 'assetsSelectorTarget')
+    cas_by_asset = index_related_ids(all_contract_agreements, 'assetId')
+
+    # Each worker runs the whole CD -> CA -> asset sequence for one asset, so assets do not wait for each other
+    cds_by_target = claim_related_ids(selected_asset_ids, cds_by_target)
+    cas_by_asset = claim_related_ids(selected_asset_ids, cas_by_asset)
+    logger.info("\n--- Deleting %s asset(s) with their contract definitions and agreements (parallel: %s) ---", len(selected_assets), args.parallel)
+    asset_results, cd_results, ca_results = {}, {}, {}
+    with ThreadPoolExecutor(max_workers=max(1, args.parallel)) as executor:
+        futures = {executor.submit(process_asset, asset, cds_by_target, cas_by_asset, cleaner): asset_id
+                   for asset_id, asset in zip(selected_asset_ids, selected_assets)}
+        for future in as_completed(futures):
+            asset_id = futures[future]
+            try:
+                asset_deleted, asset_cd_results, asset_ca_results = future.result()
+            except Exception as e:
+                # An unexpected error of one asset must not skip the summary and cache pruning of all the others
+                logger.error("Unexpected error while deleting asset '%s' with its dependencies: %r", asset_id, e)
+                asset_results[asset_id] = False
+                continue
+            asset_results[asset_id] = asset_deleted
+            cd_results.update(asset_cd_results)
+            ca_results.update(asset_ca_results)
+
+    # Keep the cached listings in line with what is left on the EDC
+    prune_cached_list(cleaner.base_url, "contract_definitions", cd_results)
+    prune_cached_list(cleaner.base_url, "contract_agreements", ca_results)
+    log_deletion_summary(asset_results, cd_results, ca_results)
+
+
+async def fetch_dependencies_async(cleaner: AsyncProviderAssetCleaner, selected_asset_ids: list, args: argparse.Namespace):
+    """Async variant of fetch_dependencies; CDs and CAs, and all filter batches, are fetched concurrently."""
+    logger.info("\n--- Fetching contract definitions and contract agreements to check dependencies ---")
+    cache_ttl = 0 if args.no_cache else args.cache_ttl
+
+    async def list_filtered(list_func, operand_left):
+        # One request per batch of selected asset IDs, all in flight at once
+        batches = await asyncio.gather(*(list_func(filter_expr) for filter_expr in asset_filter_expressions(operand_left, selected_asset_ids)))
+        return list(itertools.chain.from_iterable(batches))
+
+    all_contract_definitions, all_contract_agreements = await asyncio.gather(
+        cached_list_async(cleaner.base_url, "contract_definitions",
+                          lambda: list_unless_empty_async(cleaner.count_contract_definitions, cleaner.list_contract_definitions), cache_ttl,
+                          filtered_fn=lambda: list_filtered(cleaner.list_contract_definitions, CD_ASSET_FILTER_OPERAND)),
+        cached_list_async(cleaner.base_url, "contract_agreements",
+                          lambda: list_unless_empty_async(cleaner.count_contract_agreements, cleaner.list_contract_agreements), cache_ttl,
+                          filtered_fn=lambda: list_filtered(cleaner.list_contract_agreements, CA_ASSET_FILTER_OPERAND)),
+    )
+
+    # ---- DEBUG: Same dumps as fetch_dependencies ----
+    if args.debug and logger.isEnabledFor(logging.DEBUG):
+        if all_contract_definitions:
+            first_cd_id_debug = all_contract_definitions[0].get('@id')
+            log_first_contract_definition(all_contract_definitions, first_cd_id_debug and await cleaner.get_raw_contract_definition(first_cd_id_debug))
+        log_first_contract_agreement(all_contract_agreements)
+    # ---- END DEBUG ----
+
+    return all_contract_definitions, all_contract_agreements
+
+
+async def main_async(base_url: str, api_key: str, args: argparse.Namespace):
+    """Async variant of run_cleanup: same flow, but all HTTP calls share one aiohttp session and event loop."""
+    transport = "httpx" if args.transport == "httpx" else "aiohttp"
+    async with AsyncProviderAssetCleaner(base_url=base_url, api_key=api_key, transport=transport) as cleaner:
+        selected_assets = select_assets_for_deletion(await cleaner.list_assets(), args)
+        if not selected_assets:
+            return
+
+        selected_asset_ids = [asset.get('@id') for asset in selected_assets]
+        if args.skip_deps:
+            logger.info("\n--- Skipping contract definitions and agreements (--skip-deps) ---")
+            all_contract_definitions, all_contract_agreements = [], []
+        else:
+            all_contract_definitions, all_contract_agreements = await fetch_dependencies_async(cleaner, selected_asset_ids, args)
+
+        cd_index = index_related_ids(all_contract_definitions, 'assetsSelectorTarget')
+        ca_index = index_related_ids(all_contract_agreements, 'assetId')
+
+        # Each asset waits only for its own CDs and CAs, so the assets are not held up by each other's dependencies
+        logger.info("\n--- Deleting %s asset(s) with their contract definitions and agreements (parallel: %s) ---", len(selected_assets), args.parallel)
+        asset_results, cd_results, ca_results = await cleaner.delete_all(selected_assets, cd_index, ca_index, max_concurrency=args.parallel)
+        prune_cached_list(cleaner.base_url, "contract_definitions", cd_results)
+        prune_cached_list(cleaner.base_url, "contract_agreements", ca_results)
+
+        log_deletion_summary(asset_results, cd_results, ca_results)
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
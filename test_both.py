@@ -1,5 +1,8 @@
 import sys
 import os
+import time
+import argparse
+from multiprocessing import Process
 
 # Add project root to sys.path to allow for absolute-like imports from subdirectories
 # if __init__.py files are present in them.
@@ -11,15 +14,50 @@ sys.path.insert(0, project_root)
 from provider import run_provider_main
 from consumer import run_consumer_main
 
+
+def run_provider_or_exit(**provider_kwargs):
+    """Process target for --parallel: runs the provider and exits non-zero if it reports a failure (returns no result)."""
+    if not run_provider_main(**provider_kwargs):
+        sys.exit(1)
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the provider and then the consumer for one asset.")
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Run provider and consumer in two concurrent processes instead of one after the other.",
+    )
+    parser.add_argument(
+        "--consumer-delay",
+        type=float,
+        default=2.0,
+        metavar="SECONDS",
+        help="With --parallel: how long to wait after starting the provider before starting the consumer (default: 2).",
+    )
+    args = parser.parse_args()
 
     print("\n--- Starting Test ---")
     asset_id_input = input("Define asset_id (e.g., test-asset-123): ")
     print(f"Running Current Provider and Current Consumer with asset_id: {asset_id_input}")
     
     # Updated function calls with correct parameter names and env file paths
-    run_provider_main(asset_id=asset_id_input, env_file="provider/provider.env")
-    run_consumer_main(asset_id_param=asset_id_input, env_file_param="consumer/consumer.env")
+    provider_kwargs = {"asset_id": asset_id_input, "env_file": "provider/provider.env"}
+    consumer_kwargs = {"asset_id_param": asset_id_input, "env_file_param": "consumer/consumer.env"}
+    if args.parallel:
+        # Only the provider runs in a child process, which also keeps its environment/settings apart from the consumer's.
+        # The consumer stays in this process: a child process has no stdin for the consumer's asset selection prompts.
+        provider_process = Process(target=run_provider_or_exit, kwargs=provider_kwargs)
+        provider_process.start()
+        time.sleep(args.consumer_delay)  # Give the provider a head start to publish the asset
+        consumer_result = run_consumer_main(**consumer_kwargs)
+        provider_process.join()
+        if provider_process.exitcode != 0 or not consumer_result:
+            print(f"--- Test Failed (provider exit code: {provider_process.exitcode}, consumer: {'ok' if consumer_result else 'no data retrieved'}) ---")
+            sys.exit(1)
+    else:
+        run_provider_main(**provider_kwargs)
+        run_consumer_main(**consumer_kwargs)
     
     print("--- Test Finished ---")
 